@@ -1,6 +1,7 @@
 from django.contrib import admin
 from import_export.admin import ExportMixin, ImportExportModelAdmin
 from import_export import resources
+from .cache_utils import bump_report_data_version
 from .models import MachineLog
 
 # Define resource for import/export
@@ -11,6 +12,11 @@ class MachineLogResource(resources.ModelResource):
                   'MODE', 'STITCH_COUNT', 'NEEDLE_RUNTIME', 'NEEDLE_STOPTIME', 'Tx_LOGID',
                   'Str_LOGID', 'DEVICE_ID', 'RESERVE', 'created_at')
 
+    def after_import(self, dataset, result, **kwargs):
+        super().after_import(dataset, result, **kwargs)
+        if not kwargs.get('dry_run'):
+            bump_report_data_version()
+
 # Admin Configuration
 class MachineLogAdmin(ImportExportModelAdmin, admin.ModelAdmin):
     resource_class = MachineLogResource
@@ -18,5 +24,19 @@ class MachineLogAdmin(ImportExportModelAdmin, admin.ModelAdmin):
     search_fields = ('MACHINE_ID', 'OPERATOR_ID', 'DATE')
     list_filter = ('DATE', 'MODE')
 
+    # Log saves don't invalidate cached reports (see report_fingerprint), so
+    # edits made here do it explicitly
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        bump_report_data_version()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        bump_report_data_version()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        bump_report_data_version()
+
 # Register the model with custom admin
 admin.site.register(MachineLog, MachineLogAdmin)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LogsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'logs'
+
+    def ready(self):
+        # Connect the cache invalidation signal handlers
+        from . import cache_utils  # noqa: F401
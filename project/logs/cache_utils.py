@@ -0,0 +1,105 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ModeMessage, Operator
+
+# Replaced whenever report data changes in bulk, see report_fingerprint
+REPORT_DATA_VERSION_KEY = 'report_data_version'
+
+# Seconds a report data version lives. This bounds how long cached reports
+# and ETags can miss single logs posted by the devices.
+REPORT_DATA_VERSION_TIMEOUT = 300
+
+OPERATORS_CACHE_KEY = 'operators'
+MODE_MESSAGES_CACHE_KEY = 'mode_messages'
+
+# Seconds the operator list and mode messages stay cached. Saves and deletes
+# clear them at once; the timeout bounds staleness from any other writes.
+LOOKUP_CACHE_TIMEOUT = 300
+
+
+def get_operators():
+    """
+    (rfid_card_no, operator_name) pairs for all operators.
+
+    Operators change rarely, so the list is kept in the shared cache for
+    LOOKUP_CACHE_TIMEOUT seconds and cleared whenever an operator is saved or
+    deleted, so every worker sees the change.
+    """
+    return cache.get_or_set(
+        OPERATORS_CACHE_KEY,
+        lambda: tuple(Operator.objects.values_list('rfid_card_no', 'operator_name')),
+        LOOKUP_CACHE_TIMEOUT,
+    )
+
+
+@receiver([post_save, post_delete], sender=Operator)
+def clear_operator_cache(sender, **kwargs):
+    cache.delete(OPERATORS_CACHE_KEY)
+
+
+def get_mode_messages():
+    """{mode: message} for all mode messages, cached like get_operators."""
+    return cache.get_or_set(
+        MODE_MESSAGES_CACHE_KEY,
+        lambda: dict(ModeMessage.objects.values_list('mode', 'message')),
+        LOOKUP_CACHE_TIMEOUT,
+    )
+
+
+@receiver([post_save, post_delete], sender=ModeMessage)
+def clear_mode_message_cache(sender, **kwargs):
+    cache.delete(MODE_MESSAGES_CACHE_KEY)
+
+
+def report_fingerprint():
+    """
+    Marker of the data behind the report endpoints: a version kept in the
+    shared cache for REPORT_DATA_VERSION_TIMEOUT seconds.
+
+    Bulk inserts, admin edits and operator or mode message changes replace
+    the version at once (see bump_report_data_version). Single logs from
+    devices arrive all through the shift and don't, so they show up once the
+    version expires and starts again from the current time.
+    """
+    version = cache.get(REPORT_DATA_VERSION_KEY)
+    if version is None:
+        cache.add(REPORT_DATA_VERSION_KEY, time.time_ns(), REPORT_DATA_VERSION_TIMEOUT)
+        version = cache.get(REPORT_DATA_VERSION_KEY)
+    return version
+
+
+def report_data_settled(version):
+    """
+    Whether reports read for report data `version` can be cached. A replica
+    may not have caught up with the write that set the version yet, so with
+    one configured this waits until REPORT_REPLICA_LAG seconds after it.
+    """
+    if settings.REPORT_DATABASE == 'default':
+        return True
+    return time.time_ns() - version >= settings.REPORT_REPLICA_LAG * 1_000_000_000
+
+
+def report_etag(request, *args, **kwargs):
+    """ETag for the log endpoints, for use with django.views.decorators.http.condition."""
+    return str(report_fingerprint())
+
+
+def bump_report_data_version():
+    """
+    Invalidate cached reports and ETags. The new version is the current time,
+    written in one set(), so concurrent bumps can't cancel each other out.
+    """
+    cache.set(REPORT_DATA_VERSION_KEY, time.time_ns(), REPORT_DATA_VERSION_TIMEOUT)
+
+
+# get_consolidated_logs returns operator names and mode descriptions, so its
+# ETag has to change with them as well as with the logs
+@receiver([post_save, post_delete], sender=ModeMessage)
+@receiver([post_save, post_delete], sender=Operator)
+def report_data_changed(sender, **kwargs):
+    bump_report_data_version()
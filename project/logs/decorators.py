@@ -0,0 +1,53 @@
+import hashlib
+from datetime import date
+from functools import wraps
+
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from .cache_utils import report_data_settled, report_fingerprint
+
+
+def with_parsed_dates(view_func):
+    """
+    Parse the optional `from_date` / `to_date` query parameters (YYYY-MM-DD)
+    once per request and attach them as `request.from_date` / `request.to_date`
+    (None when not provided). Invalid dates get a 400 response.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        for param in ('from_date', 'to_date'):
+            value = request.GET.get(param, '')
+            try:
+                parsed = date.fromisoformat(value) if value else None
+            except ValueError:
+                return Response({"error": f"Invalid {param} format. Use YYYY-MM-DD"}, status=400)
+            setattr(request, param, parsed)
+        return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+def cached_report(timeout):
+    """
+    Cache a report view's successful responses per full request path for
+    `timeout` seconds. A cached report is only served while
+    report_fingerprint() is unchanged (see there for when it changes), and
+    reports read from a lagging replica are not cached (see report_data_settled).
+
+    The path is hashed into the key, so long or unusual query strings can't
+    overflow the cache's key column or fail memcached key validation.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            key = f'report:{hashlib.sha256(request.get_full_path().encode()).hexdigest()}'
+            fingerprint = report_fingerprint()
+            cached = cache.get(key)
+            if cached is not None and cached['fingerprint'] == fingerprint:
+                return Response(cached['data'])
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200 and report_data_settled(fingerprint):
+                cache.set(key, {'fingerprint': fingerprint, 'data': response.data}, timeout)
+            return response
+        return wrapper
+    return decorator
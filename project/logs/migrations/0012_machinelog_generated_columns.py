@@ -0,0 +1,111 @@
+# Generated by Django 5.2.18 on 2026-10-16 09:40
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+import django.db.models.functions.datetime
+import django.db.models.lookups
+from django.db import migrations, models
+
+
+class AddFieldsTogether(migrations.operations.base.Operation):
+    """
+    Run several AddField operations on one model. On PostgreSQL their columns
+    are added by a single ALTER TABLE, so adding stored generated columns
+    rewrites the table once instead of once per column. Other databases add
+    the fields one by one.
+    """
+    reversible = True
+
+    def __init__(self, model_name, operations):
+        self.model_name = model_name
+        self.operations = operations
+
+    def deconstruct(self):
+        return (self.__class__.__name__, [], {'model_name': self.model_name, 'operations': self.operations})
+
+    def state_forwards(self, app_label, state):
+        for operation in self.operations:
+            operation.state_forwards(app_label, state)
+
+    def intermediate_states(self, app_label, state):
+        """The states before and after each operation, starting from `state`."""
+        states = [state]
+        for operation in self.operations:
+            state = state.clone()
+            operation.state_forwards(app_label, state)
+            states.append(state)
+        return states
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            states = self.intermediate_states(app_label, from_state)
+            for index, operation in enumerate(self.operations):
+                operation.database_forwards(app_label, schema_editor, states[index], states[index + 1])
+            return
+
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        columns, params = [], []
+        for operation in self.operations:
+            field = model._meta.get_field(operation.name)
+            definition, column_params = schema_editor.column_sql(model, field)
+            columns.append(f'ADD COLUMN {schema_editor.quote_name(field.column)} {definition}')
+            params.extend(column_params)
+        schema_editor.execute(
+            f'ALTER TABLE {schema_editor.quote_name(model._meta.db_table)} {", ".join(columns)}', params
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        states = self.intermediate_states(app_label, to_state)
+        for index in reversed(range(len(self.operations))):
+            self.operations[index].database_backwards(app_label, schema_editor, states[index + 1], states[index])
+
+    def describe(self):
+        return f'Add fields {", ".join(operation.name for operation in self.operations)} to {self.model_name}'
+
+    @property
+    def migration_name_fragment(self):
+        return f'{self.model_name.lower()}_generated_columns'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logs', '0011_alter_machinelog_date_alter_machinelog_mode_and_more'),
+    ]
+
+    operations = [
+        # Stored generated columns. Adding one rewrites the whole table, so
+        # they are added by one ALTER TABLE
+        AddFieldsTogether(
+            model_name='machinelog',
+            operations=[
+                migrations.AddField(
+                    model_name='machinelog',
+                    name='START_SECONDS',
+                    field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('START_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('START_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('START_TIME')), output_field=models.IntegerField()),
+                ),
+                migrations.AddField(
+                    model_name='machinelog',
+                    name='END_SECONDS',
+                    field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('END_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('END_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('END_TIME')), output_field=models.IntegerField()),
+                ),
+                migrations.AddField(
+                    model_name='machinelog',
+                    name='WORK_SECONDS',
+                    field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(models.Q(django.db.models.lookups.LessThan(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('START_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('START_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('START_TIME')), 30300), django.db.models.lookups.GreaterThan(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('END_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('END_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('END_TIME')), 70500), models.Q(django.db.models.lookups.GreaterThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('START_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('START_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('START_TIME')), 37800), django.db.models.lookups.LessThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('END_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('END_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('END_TIME')), 38400)), models.Q(django.db.models.lookups.GreaterThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('START_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('START_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('START_TIME')), 48000), django.db.models.lookups.LessThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('END_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('END_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('END_TIME')), 50400)), models.Q(django.db.models.lookups.GreaterThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('START_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('START_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('START_TIME')), 58800), django.db.models.lookups.LessThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('END_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('END_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('END_TIME')), 59400)), _connector='OR'), then=models.Value(None)), default=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('END_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('END_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('END_TIME')), '-', django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('START_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('START_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('START_TIME'))), output_field=models.FloatField()), output_field=models.FloatField()),
+                ),
+                migrations.AddField(
+                    model_name='machinelog',
+                    name='SHIFT_SECONDS',
+                    field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(models.Q(models.Q(django.db.models.lookups.GreaterThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('START_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('START_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('START_TIME')), 37800), django.db.models.lookups.LessThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('END_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('END_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('END_TIME')), 38400)), models.Q(django.db.models.lookups.GreaterThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('START_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('START_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('START_TIME')), 48000), django.db.models.lookups.LessThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('END_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('END_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('END_TIME')), 50400)), models.Q(django.db.models.lookups.GreaterThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('START_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('START_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('START_TIME')), 58800), django.db.models.lookups.LessThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('END_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('END_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('END_TIME')), 59400)), _connector='OR'), then=models.Value(None)), models.When(django.db.models.lookups.GreaterThan(django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Least(django.db.models.functions.comparison.Greatest(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('END_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('END_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('END_TIME')), 30600), 70200), '-', django.db.models.functions.comparison.Least(django.db.models.functions.comparison.Greatest(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('START_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('START_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('START_TIME')), 30600), 70200)), 0), then=django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Least(django.db.models.functions.comparison.Greatest(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('END_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('END_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('END_TIME')), 30600), 70200), '-', django.db.models.functions.comparison.Least(django.db.models.functions.comparison.Greatest(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractHour('START_TIME'), '*', models.Value(3600)), '+', django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.ExtractMinute('START_TIME'), '*', models.Value(60))), '+', django.db.models.functions.datetime.ExtractSecond('START_TIME')), 30600), 70200))), default=models.Value(None), output_field=models.FloatField()), output_field=models.FloatField()),
+                ),
+                migrations.AddField(
+                    model_name='machinelog',
+                    name='RESERVE_NUMERIC',
+                    field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(RESERVE__regex='^ *-?[0-9]{1,9} *$', then=django.db.models.functions.comparison.Cast('RESERVE', output_field=models.IntegerField())), default=models.Value(None), output_field=models.IntegerField()), output_field=models.IntegerField()),
+                ),
+            ],
+        ),
+    ]
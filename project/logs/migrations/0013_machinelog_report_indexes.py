@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-16 09:40
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('logs', '0012_machinelog_generated_columns'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='machinelog',
+            index=models.Index(fields=['MACHINE_ID'], name='logs_machin_MACHINE_ac27eb_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='machinelog',
+            index=models.Index(fields=['LINE_NUMB'], name='logs_machin_LINE_NU_dfcfd8_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='machinelog',
+            index=models.Index(fields=['OPERATOR_ID'], name='logs_machin_OPERATO_b22b20_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='machinelog',
+            index=models.Index(fields=['Str_LOGID', 'MACHINE_ID', 'DATE'], name='logs_machin_Str_LOG_b6c614_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='machinelog',
+            index=models.Index(fields=['START_SECONDS', 'END_SECONDS'], name='logs_machin_START_S_d44fcd_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='machinelog',
+            index=models.Index(fields=['DATE', 'LINE_NUMB'], name='logs_machin_DATE_660835_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='machinelog',
+            index=models.Index(fields=['LINE_NUMB', 'DATE', 'MODE'], include=('WORK_SECONDS', 'STITCH_COUNT', 'NEEDLE_RUNTIME', 'RESERVE_NUMERIC'), name='ml_line_date_mode'),
+        ),
+        AddIndexConcurrently(
+            model_name='machinelog',
+            index=models.Index(fields=['MACHINE_ID', 'DATE', 'MODE'], include=('WORK_SECONDS', 'STITCH_COUNT', 'NEEDLE_RUNTIME', 'RESERVE_NUMERIC'), name='ml_machine_date_mode'),
+        ),
+        AddIndexConcurrently(
+            model_name='machinelog',
+            index=models.Index(fields=['OPERATOR_ID', 'DATE', 'MODE'], include=('SHIFT_SECONDS', 'STITCH_COUNT', 'NEEDLE_RUNTIME', 'RESERVE_NUMERIC'), name='ml_operator_date_mode'),
+        ),
+    ]
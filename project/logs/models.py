@@ -1,6 +1,119 @@
 from django.db import models
+from django.db.models import Case, ExpressionWrapper, F, FloatField, IntegerField, Q, Value, When
+from django.db.models.functions import Cast, ExtractHour, ExtractMinute, ExtractSecond, Greatest, Least
+from django.db.models.lookups import GreaterThan, GreaterThanOrEqual, LessThan, LessThanOrEqual
+
+# Working hours used by the line/machine reports (8:25 AM to 7:35 PM), in seconds since midnight
+REPORT_START_SECONDS = 30300
+REPORT_END_SECONDS = 70500
+
+# Operator shift used by the operator reports (8:30 AM to 7:30 PM), in seconds since midnight
+SHIFT_START_SECONDS = 30600
+SHIFT_END_SECONDS = 70200
+
+# Break periods, in seconds since midnight
+BREAK_PERIODS = (
+    (37800, 38400),  # 10:30-10:40
+    (48000, 50400),  # 13:20-14:00
+    (58800, 59400),  # 16:20-16:30
+)
+
+# Database-computed MachineLog columns used only by the report queries; list
+# endpoints defer them and leave them out of serialized output
+GENERATED_FIELDS = ('START_SECONDS', 'END_SECONDS', 'WORK_SECONDS', 'SHIFT_SECONDS', 'RESERVE_NUMERIC')
+
+
+def seconds_since_midnight(field):
+    """Expression converting a TimeField to seconds since midnight."""
+    return ExtractHour(field) * 3600 + ExtractMinute(field) * 60 + ExtractSecond(field)
+
+
+def within_break(start_seconds, end_seconds):
+    """Condition matching logs that lie entirely within a break period."""
+    condition = Q()
+    for break_start, break_end in BREAK_PERIODS:
+        condition |= Q(
+            GreaterThanOrEqual(start_seconds, break_start),
+            LessThanOrEqual(end_seconds, break_end),
+        )
+    return condition
+
+
+def work_seconds_expression():
+    """
+    Duration in seconds of a log within the report working hours.
+
+    NULL when the log starts before 8:25 AM, ends after 7:35 PM or lies
+    entirely within a break period.
+    """
+    start_seconds = seconds_since_midnight('START_TIME')
+    end_seconds = seconds_since_midnight('END_TIME')
+    outside_working_hours = (
+        Q(LessThan(start_seconds, REPORT_START_SECONDS)) |
+        Q(GreaterThan(end_seconds, REPORT_END_SECONDS)) |
+        within_break(start_seconds, end_seconds)
+    )
+    return Case(
+        When(outside_working_hours, then=Value(None)),
+        default=end_seconds - start_seconds,
+        output_field=FloatField(),
+    )
+
+
+def shift_seconds_expression():
+    """
+    Duration in seconds of a log clamped to the operator shift.
+
+    NULL when nothing of the log falls within 8:30 AM to 7:30 PM or when it
+    lies entirely within a break period.
+    """
+    start_seconds = seconds_since_midnight('START_TIME')
+    end_seconds = seconds_since_midnight('END_TIME')
+    shift_seconds = (
+        Least(Greatest(end_seconds, SHIFT_START_SECONDS), SHIFT_END_SECONDS) -
+        Least(Greatest(start_seconds, SHIFT_START_SECONDS), SHIFT_END_SECONDS)
+    )
+    return Case(
+        When(within_break(start_seconds, end_seconds), then=Value(None)),
+        When(GreaterThan(shift_seconds, 0), then=shift_seconds),
+        default=Value(None),
+        output_field=FloatField(),
+    )
+
+
+def reserve_numeric_expression():
+    """
+    RESERVE (the sewing speed sent by the device) as an integer.
+
+    NULL when RESERVE is not a whole number of at most 9 digits (which always
+    fits an integer column), so an unexpected value cannot make the insert fail.
+    """
+    return Case(
+        When(RESERVE__regex=r'^ *-?[0-9]{1,9} *$', then=Cast('RESERVE', output_field=IntegerField())),
+        default=Value(None),
+        output_field=IntegerField(),
+    )
+
+
+class MachineLogQuerySet(models.QuerySet):
+    def in_working_hours(self):
+        """
+        Logs counted by the line/machine reports (WORK_SECONDS is not NULL),
+        annotated with `duration_hours`.
+        """
+        return self.filter(WORK_SECONDS__isnull=False).annotate(
+            duration_hours=ExpressionWrapper(F('WORK_SECONDS') / 3600.0, output_field=FloatField()),
+        )
+
+    def in_shift(self):
+        """
+        Logs counted by the operator reports (SHIFT_SECONDS is not NULL),
+        annotated with `duration_hours`.
+        """
+        return self.filter(SHIFT_SECONDS__isnull=False).annotate(
+            duration_hours=ExpressionWrapper(F('SHIFT_SECONDS') / 3600.0, output_field=FloatField()),
+        )
 
-from django.db import models
 
 class MachineLog(models.Model):
     MACHINE_ID = models.IntegerField()
@@ -19,12 +132,67 @@ class MachineLog(models.Model):
     DEVICE_ID = models.IntegerField()
     RESERVE = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)  # Index added
+    # Computed by the database on write so reports don't re-derive it per query
+    START_SECONDS = models.GeneratedField(
+        expression=seconds_since_midnight('START_TIME'),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
+    END_SECONDS = models.GeneratedField(
+        expression=seconds_since_midnight('END_TIME'),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
+    WORK_SECONDS = models.GeneratedField(
+        expression=work_seconds_expression(),
+        output_field=models.FloatField(),
+        db_persist=True,
+    )
+    SHIFT_SECONDS = models.GeneratedField(
+        expression=shift_seconds_expression(),
+        output_field=models.FloatField(),
+        db_persist=True,
+    )
+    RESERVE_NUMERIC = models.GeneratedField(
+        expression=reserve_numeric_expression(),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
+
+    objects = MachineLogQuerySet.as_manager()
 
     class Meta:
         indexes = [
             models.Index(fields=['DATE']),
             models.Index(fields=['created_at']),
             models.Index(fields=['MODE']),
+            # Distinct machine/line counts and per-operator lookups
+            models.Index(fields=['MACHINE_ID']),
+            models.Index(fields=['LINE_NUMB']),
+            models.Index(fields=['OPERATOR_ID']),
+            # Str_LOGID duplicate check in log_machine_data
+            models.Index(fields=['Str_LOGID', 'MACHINE_ID', 'DATE']),
+            # Working-hours / break range filters
+            models.Index(fields=['START_SECONDS', 'END_SECONDS']),
+            # Distinct line numbers within a date range (get_line_numbers)
+            models.Index(fields=['DATE', 'LINE_NUMB']),
+            # Line, machine and operator report filters; the included columns
+            # let the per-mode sums be answered from the index alone
+            models.Index(
+                fields=['LINE_NUMB', 'DATE', 'MODE'],
+                include=['WORK_SECONDS', 'STITCH_COUNT', 'NEEDLE_RUNTIME', 'RESERVE_NUMERIC'],
+                name='ml_line_date_mode',
+            ),
+            models.Index(
+                fields=['MACHINE_ID', 'DATE', 'MODE'],
+                include=['WORK_SECONDS', 'STITCH_COUNT', 'NEEDLE_RUNTIME', 'RESERVE_NUMERIC'],
+                name='ml_machine_date_mode',
+            ),
+            models.Index(
+                fields=['OPERATOR_ID', 'DATE', 'MODE'],
+                include=['SHIFT_SECONDS', 'STITCH_COUNT', 'NEEDLE_RUNTIME', 'RESERVE_NUMERIC'],
+                name='ml_operator_date_mode',
+            ),
         ]
 
 class DuplicateLog(models.Model):
@@ -0,0 +1,10 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+class MachineLogPagination(PageNumberPagination):
+    """
+    Page-number pagination for the machine log listing (`?page=N&page_size=M`).
+    """
+    page_size = 500
+    page_size_query_param = 'page_size'
+    max_page_size = 2000
@@ -0,0 +1,42 @@
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Rows encoded per chunk yielded by stream_json_array
+STREAM_CHUNK_ROWS = 500
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    JSON renderer backed by orjson, used by the report endpoints that return
+    large float-heavy payloads.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+
+def stream_json_array(items):
+    """
+    Encode an iterable of dicts as a JSON array in chunks, for use with
+    StreamingHttpResponse. Dates and times are formatted the way DRF's
+    JSONEncoder formats them, so the output matches a regular Response.
+    """
+    default = JSONEncoder().default
+    option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    chunk = []
+    yield b'['
+    for index, item in enumerate(items):
+        if index:
+            chunk.append(b',')
+        chunk.append(orjson.dumps(item, default=default, option=option))
+        if len(chunk) >= STREAM_CHUNK_ROWS * 2:
+            yield b''.join(chunk)
+            chunk = []
+    chunk.append(b']')
+    yield b''.join(chunk)
@@ -63,9 +63,18 @@
 
 
 from rest_framework import serializers
-from .models import MachineLog, ModeMessage, Operator
+from .cache_utils import get_mode_messages, get_operators
+from .models import GENERATED_FIELDS, MachineLog, ModeMessage, Operator
 from datetime import datetime
 
+class MachineLogListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        # Use the cached operator names and mode messages for the whole list
+        # instead of querying them for every row
+        self.context.setdefault('operator_names', dict(get_operators()))
+        self.context.setdefault('mode_messages', get_mode_messages())
+        return super().to_representation(data)
+
 class MachineLogSerializer(serializers.ModelSerializer):
     DATE = serializers.CharField()  # Accept date as a string initially
     START_TIME = serializers.CharField()  # Accept time as a string initially
@@ -75,9 +84,13 @@ class MachineLogSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = MachineLog
-        fields = '__all__'  # Keep all existing fields + added fields
+        exclude = GENERATED_FIELDS  # Keep all stored fields + added fields
+        list_serializer_class = MachineLogListSerializer
 
     def get_operator_name(self, obj):
+        operator_names = self.context.get('operator_names')
+        if operator_names is not None:
+            return operator_names.get(obj.OPERATOR_ID)
         try:
             operator = Operator.objects.get(rfid_card_no=obj.OPERATOR_ID)
             return operator.operator_name
@@ -85,6 +98,9 @@ class MachineLogSerializer(serializers.ModelSerializer):
             return None
 
     def get_mode_description(self, obj):
+        mode_messages = self.context.get('mode_messages')
+        if mode_messages is not None:
+            return mode_messages.get(obj.MODE, "N/A")
         mode_message = ModeMessage.objects.filter(mode=obj.MODE).first()
         return mode_message.message if mode_message else "N/A"
 
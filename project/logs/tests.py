@@ -1,3 +1,695 @@
-from django.test import TestCase
+import json
+import time as clock
+import warnings
+from datetime import date, time
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import CacheKeyWarning, cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient, APIRequestFactory
+
+from .cache_utils import REPORT_DATA_VERSION_KEY, bump_report_data_version, report_data_settled
+from .models import DuplicateLog, MachineLog, ModeMessage, Operator
+from .renderers import STREAM_CHUNK_ROWS, stream_json_array
+from .views import all_operators_report, distinct_count, operator_report
+
+
+def log_fields(**fields):
+    """MachineLog field values, with defaults for every field not given."""
+    values = dict(
+        MACHINE_ID=1, LINE_NUMB=1, OPERATOR_ID='1001', DATE=date(2025, 3, 4),
+        START_TIME=time(9, 0), END_TIME=time(9, 30), MODE=1, STITCH_COUNT=10,
+        NEEDLE_RUNTIME=5.0, NEEDLE_STOPTIME=1.0, Tx_LOGID=1, Str_LOGID=1,
+        DEVICE_ID=1, RESERVE='100',
+    )
+    values.update(fields)
+    return values
+
+
+def create_log(**fields):
+    """Save a MachineLog with defaults for every field not given."""
+    return MachineLog.objects.create(**log_fields(**fields))
+
+
+def generated_value(log, field_name):
+    """A database-computed column of a saved log."""
+    return MachineLog.objects.values_list(field_name, flat=True).get(pk=log.pk)
+
+
+def log_payload(**fields):
+    """A log as the devices post it to log_machine_data / log_machine_data_bulk."""
+    payload = dict(
+        MACHINE_ID=9, LINE_NUMB=1, OPERATOR_ID='1001', DATE='2025:03:04',
+        START_TIME='9:0:0', END_TIME='9:30', MODE=1, STITCH_COUNT=5,
+        NEEDLE_RUNTIME=1.0, NEEDLE_STOPTIME=1.0, Tx_LOGID=1, Str_LOGID=1,
+        DEVICE_ID=1, RESERVE='0',
+    )
+    payload.update(fields)
+    return payload
+
+
+class WorkSecondsTests(TestCase):
+    def work_seconds(self, start, end):
+        return generated_value(create_log(START_TIME=start, END_TIME=end), 'WORK_SECONDS')
+
+    def test_working_hour_edges_are_inclusive(self):
+        # Working hours are 8:25 AM to 7:35 PM
+        self.assertEqual(self.work_seconds(time(8, 25), time(8, 35)), 600)
+        self.assertEqual(self.work_seconds(time(19, 25), time(19, 35)), 600)
+
+    def test_null_outside_working_hours(self):
+        self.assertIsNone(self.work_seconds(time(8, 24, 59), time(8, 35)))
+        self.assertIsNone(self.work_seconds(time(19, 25), time(19, 35, 1)))
+        self.assertIsNone(self.work_seconds(time(6, 0), time(7, 0)))
+
+    def test_null_inside_a_break(self):
+        # 10:30-10:40, 13:20-14:00 and 16:20-16:30, edges included
+        self.assertIsNone(self.work_seconds(time(10, 30), time(10, 40)))
+        self.assertIsNone(self.work_seconds(time(13, 30), time(13, 50)))
+        self.assertIsNone(self.work_seconds(time(16, 21), time(16, 29)))
+
+    def test_logs_overlapping_a_break_keep_their_full_duration(self):
+        self.assertEqual(self.work_seconds(time(10, 25), time(10, 35)), 600)
+        self.assertEqual(self.work_seconds(time(13, 0), time(14, 30)), 5400)
+
+    def test_in_working_hours_annotates_duration_hours(self):
+        create_log(START_TIME=time(9, 0), END_TIME=time(10, 30))
+        create_log(START_TIME=time(10, 30), END_TIME=time(10, 40))
+        create_log(START_TIME=time(20, 0), END_TIME=time(20, 30))
+
+        self.assertEqual(
+            list(MachineLog.objects.in_working_hours().values_list('duration_hours', flat=True)), [1.5]
+        )
+
+
+class ParsedDatesTests(TestCase):
+    def test_invalid_dates_return_400(self):
+        client = APIClient()
+
+        response = client.get('/api/api/operator_reports/?from_date=2025-02-30')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"error": "Invalid from_date format. Use YYYY-MM-DD"})
+
+        response = client.get('/api/api/operator_reports/?from_date=2025-03-01&to_date=03/31/2025')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"error": "Invalid to_date format. Use YYYY-MM-DD"})
+
+    def test_valid_dates_are_accepted(self):
+        response = APIClient().get('/api/api/operator_reports/?from_date=2025-03-01&to_date=2025-03-31')
+
+        self.assertEqual(response.status_code, 200)
+
+
+class ShiftSecondsTests(TestCase):
+    def shift_seconds(self, start, end):
+        return generated_value(create_log(START_TIME=start, END_TIME=end), 'SHIFT_SECONDS')
+
+    def test_clamped_to_the_shift(self):
+        # The shift is 8:30 AM to 7:30 PM
+        self.assertEqual(self.shift_seconds(time(9, 0), time(9, 30)), 1800)
+        self.assertEqual(self.shift_seconds(time(8, 0), time(9, 0)), 1800)
+        self.assertEqual(self.shift_seconds(time(19, 0), time(20, 0)), 1800)
+        self.assertEqual(self.shift_seconds(time(8, 0), time(20, 0)), 39600)
+
+    def test_null_outside_the_shift(self):
+        self.assertIsNone(self.shift_seconds(time(7, 0), time(8, 30)))
+        self.assertIsNone(self.shift_seconds(time(19, 30), time(20, 0)))
+
+    def test_null_inside_a_break(self):
+        self.assertIsNone(self.shift_seconds(time(16, 21), time(16, 29)))
+        # Overlapping a break isn't enough
+        self.assertEqual(self.shift_seconds(time(16, 15), time(16, 25)), 600)
+
+    def test_in_shift_annotates_duration_hours(self):
+        create_log(START_TIME=time(8, 0), END_TIME=time(9, 0))
+        create_log(START_TIME=time(7, 0), END_TIME=time(8, 0))
+
+        self.assertEqual(list(MachineLog.objects.in_shift().values_list('duration_hours', flat=True)), [0.5])
+
+
+class LogMachineDataBulkTests(TestCase):
+    def post_bulk(self, data):
+        return APIClient().post('/api/log/bulk/', data, format='json')
+
+    def test_saves_all_new_logs(self):
+        response = self.post_bulk([log_payload(Str_LOGID=1500), log_payload(Str_LOGID=1600, START_TIME='10:0:0', END_TIME='10:15')])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['saved'], response.data['skipped']), (2, 0))
+        # Str_LOGID above 1000 is stored with 1000 subtracted, and the device's
+        # date and time formats are parsed before the generated columns are computed
+        self.assertEqual(
+            list(MachineLog.objects.order_by('Str_LOGID').values_list('Str_LOGID', 'DATE', 'START_SECONDS', 'WORK_SECONDS')),
+            [(500, date(2025, 3, 4), 32400, 1800.0), (600, date(2025, 3, 4), 36000, 900.0)],
+        )
+
+    def test_skips_duplicates_within_the_batch(self):
+        response = self.post_bulk([log_payload(Str_LOGID=1600), log_payload(Str_LOGID=1600)])
+
+        self.assertEqual((response.data['saved'], response.data['skipped']), (1, 1))
+        self.assertEqual(MachineLog.objects.count(), 1)
+
+    def test_skips_logs_already_in_the_database(self):
+        create_log(MACHINE_ID=9, Str_LOGID=500)
+
+        response = self.post_bulk([log_payload(Str_LOGID=1500), log_payload(Str_LOGID=1500, MACHINE_ID=8)])
+
+        self.assertEqual((response.data['saved'], response.data['skipped']), (1, 1))
+        self.assertEqual(
+            sorted(MachineLog.objects.filter(Str_LOGID=500).values_list('MACHINE_ID', flat=True)), [8, 9]
+        )
+        # Skipped duplicates are dropped, not recorded
+        self.assertFalse(DuplicateLog.objects.exists())
+
+    def test_does_not_deduplicate_unadjusted_log_ids(self):
+        create_log(MACHINE_ID=9, Str_LOGID=20)
+
+        response = self.post_bulk([log_payload(Str_LOGID=20), log_payload(Str_LOGID=20)])
+
+        self.assertEqual((response.data['saved'], response.data['skipped']), (2, 0))
+        self.assertEqual(MachineLog.objects.filter(Str_LOGID=20).count(), 3)
+
+    def test_rejects_the_whole_batch_on_an_invalid_mode(self):
+        response = self.post_bulk([log_payload(Str_LOGID=20), log_payload(MODE=9)])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(MachineLog.objects.exists())
+
+    def test_rejects_a_non_list_body(self):
+        response = self.post_bulk(log_payload())
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(MachineLog.objects.exists())
+
+
+class MachineLogPaginationTests(TestCase):
+    def setUp(self):
+        for str_log_id in range(1, 6):
+            create_log(Str_LOGID=str_log_id)
+
+    def test_returns_requested_page_with_continuing_index(self):
+        response = APIClient().get('/api/logs/?page=2&page_size=2')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 5)
+        # Newest first, so page 2 holds the 3rd and 2nd logs saved
+        self.assertEqual(
+            [(log['index'], log['Str_LOGID']) for log in response.data['results']], [(3, 3), (4, 2)]
+        )
+
+    def test_page_size_is_capped(self):
+        MachineLog.objects.bulk_create(MachineLog(**log_fields()) for _ in range(2000))
+
+        response = APIClient().get('/api/logs/?page=1&page_size=100000')
+
+        self.assertEqual(len(response.data['results']), 2000)
+        self.assertEqual(response.data['results'][-1]['index'], 2000)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_unpaginated_listing_returns_all_logs(self):
+        response = APIClient().get('/api/logs/')
+
+        self.assertEqual([log['index'] for log in response.data], [1, 2, 3, 4, 5])
+        self.assertNotIn('WORK_SECONDS', response.data[0])
+
+
+class StartEndSecondsTests(TestCase):
+    def test_seconds_since_midnight(self):
+        log = create_log(START_TIME=time(8, 25, 30), END_TIME=time(19, 35))
+
+        self.assertEqual((generated_value(log, 'START_SECONDS'), generated_value(log, 'END_SECONDS')), (30330, 70500))
+
+    def test_day_edges(self):
+        log = create_log(START_TIME=time(0, 0), END_TIME=time(23, 59, 59))
+
+        self.assertEqual((generated_value(log, 'START_SECONDS'), generated_value(log, 'END_SECONDS')), (0, 86399))
+
+    def test_recomputed_on_save(self):
+        log = create_log(START_TIME=time(9, 0), END_TIME=time(9, 30))
+        log.START_TIME = time(9, 10)
+        log.save()
+
+        self.assertEqual(generated_value(log, 'START_SECONDS'), 33000)
+        self.assertEqual(generated_value(log, 'WORK_SECONDS'), 1200)
+
+
+class DistinctCountTests(TestCase):
+    def setUp(self):
+        for machine_id, line_number in ((1, 1), (2, 1), (2, 2), (3, 2)):
+            create_log(MACHINE_ID=machine_id, LINE_NUMB=line_number)
+
+    def test_exact_by_default(self):
+        self.assertEqual(distinct_count(MachineLog, 'MACHINE_ID'), 3)
+        self.assertEqual(distinct_count(MachineLog, 'LINE_NUMB'), 2)
+
+    def test_estimate_falls_back_to_exact_without_statistics(self):
+        self.assertEqual(distinct_count(MachineLog, 'MACHINE_ID', estimate=True), 3)
+
+    def test_count_endpoints(self):
+        client = APIClient()
+
+        self.assertEqual(client.get('/api/machine_count/').data, {"machine_id_count": 3})
+        self.assertEqual(client.get('/api/line_count/?estimate=true').data, {"line_number_count": 2})
+
+
+class FilterLogsTests(TestCase):
+    def setUp(self):
+        Operator.objects.create(rfid_card_no='1001', operator_name='Asha')
+        self.log = create_log(MACHINE_ID=1, LINE_NUMB=1, DATE=date(2025, 3, 4), MODE=1)
+        create_log(MACHINE_ID=2, LINE_NUMB=2, DATE=date(2025, 3, 5), MODE=5, OPERATOR_ID='0')
+        create_log(MACHINE_ID=1, LINE_NUMB=2, DATE=date(2025, 3, 6), MODE=7, OPERATOR_ID='2002')
+
+    def get_rows(self, url):
+        response = APIClient().get(url)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(b''.join(response.streaming_content))
+
+    def test_rows_are_described(self):
+        rows = self.get_rows('/api/logs/filter/?line_number=1')
+
+        self.assertEqual(rows, [{
+            'id': self.log.pk, 'MACHINE_ID': 1, 'LINE_NUMB': 1, 'OPERATOR_ID': '1001',
+            'DATE': '2025-03-04', 'START_TIME': '09:00:00', 'END_TIME': '09:30:00', 'MODE': 1,
+            'STITCH_COUNT': 10, 'NEEDLE_RUNTIME': 5.0, 'NEEDLE_STOPTIME': 1.0, 'Tx_LOGID': 1,
+            'Str_LOGID': 1, 'DEVICE_ID': 1, 'RESERVE': '100', 'created_at': rows[0]['created_at'],
+            'mode_description': 'Sewing', 'operator_name': 'Asha',
+        }])
+
+    def test_unknown_modes_and_operators(self):
+        rows = self.get_rows('/api/logs/filter/?line_number=2')
+
+        self.assertEqual(
+            sorted((row['mode_description'], row['operator_name']) for row in rows),
+            [('Maintenance', ''), ('Unknown mode', '')],
+        )
+
+    def test_filters_by_date_range(self):
+        rows = self.get_rows('/api/logs/filter/?line_number=all&from_date=2025-03-05&to_date=2025-03-06')
+
+        self.assertEqual(sorted(row['DATE'] for row in rows), ['2025-03-05', '2025-03-06'])
+
+    def test_response_is_streamed(self):
+        response = APIClient().get('/api/logs/filter/?line_number=9')
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(b''.join(response.streaming_content), b'[]')
+
+    def test_filters_by_machine_id(self):
+        rows = self.get_rows('/api/logs/machine-filter?machine_id=1&to_date=2025-03-05')
+        self.assertEqual([row['id'] for row in rows], [self.log.pk])
+
+        rows = self.get_rows('/api/logs/machine-filter?machine_id=all')
+        self.assertEqual(len(rows), 3)
+
+
+class StreamJsonArrayTests(TestCase):
+    def test_encodes_like_the_drf_json_encoder(self):
+        rows = [{'DATE': date(2025, 3, 4), 'START_TIME': time(9, 5, 7), 'NEEDLE_RUNTIME': 1.5}, {1: None}]
+
+        self.assertEqual(
+            json.loads(b''.join(stream_json_array(rows))),
+            [{'DATE': '2025-03-04', 'START_TIME': '09:05:07', 'NEEDLE_RUNTIME': 1.5}, {'1': None}],
+        )
+
+    def test_yields_chunks_of_rows(self):
+        rows = [{'index': index} for index in range(2 * STREAM_CHUNK_ROWS + 1)]
+
+        chunks = list(stream_json_array(rows))
+
+        # The opening bracket, two full chunks and the last row with the closing bracket
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(json.loads(b''.join(chunks)), rows)
+
+
+class CachedReportTests(TestCase):
+    url = '/api/logs/line-numbers/?from_date=2025-03-01&to_date=2025-03-31'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.log = create_log(LINE_NUMB=1)
+
+    def line_numbers(self, url=None):
+        return self.client.get(url or self.url).data['line_numbers']
+
+    def test_single_log_saves_are_served_from_cache_until_the_version_expires(self):
+        self.assertEqual(self.line_numbers(), [1])
+        create_log(LINE_NUMB=2)
+        self.assertEqual(self.line_numbers(), [1])
+
+        # What REPORT_DATA_VERSION_TIMEOUT expiring does
+        cache.delete(REPORT_DATA_VERSION_KEY)
+        self.assertEqual(self.line_numbers(), [1, 2])
+
+    def test_bump_invalidates(self):
+        self.assertEqual(self.line_numbers(), [1])
+        MachineLog.objects.filter(pk=self.log.pk).update(LINE_NUMB=3)
+        bump_report_data_version()
+        self.assertEqual(self.line_numbers(), [3])
+
+    def test_bulk_insert_invalidates(self):
+        self.assertEqual(self.line_numbers(), [1])
+        self.client.post('/api/log/bulk/', [log_payload(LINE_NUMB=4)], format='json')
+        self.assertEqual(self.line_numbers(), [1, 4])
+
+    def test_operator_changes_invalidate(self):
+        self.assertEqual(self.line_numbers(), [1])
+        create_log(LINE_NUMB=5)
+        Operator.objects.create(rfid_card_no='1001', operator_name='Asha')
+        self.assertEqual(self.line_numbers(), [1, 5])
+
+    def test_admin_delete_invalidates(self):
+        create_log(LINE_NUMB=6)
+        self.assertEqual(self.line_numbers(), [1, 6])
+
+        admin_user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(admin_user)
+        self.client.post(f'/admin/logs/machinelog/{self.log.pk}/delete/', {'post': 'yes'})
+
+        self.assertEqual(self.line_numbers(), [6])
+
+    def test_errors_are_not_cached(self):
+        self.assertEqual(self.client.get('/api/logs/line-numbers/').status_code, 400)
+        self.assertEqual(self.client.get('/api/logs/line-numbers/').status_code, 400)
+
+    def test_long_query_strings_get_a_valid_cache_key(self):
+        url = f'{self.url}&note={"x" * 300}'
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', CacheKeyWarning)
+            self.assertEqual(self.line_numbers(url), [1])
+            create_log(LINE_NUMB=2)
+            self.assertEqual(self.line_numbers(url), [1])
+
+
+class ReportReplicaLagTests(TestCase):
+    def test_primary_reads_are_always_settled(self):
+        self.assertTrue(report_data_settled(clock.time_ns()))
+
+    @override_settings(REPORT_DATABASE='replica', REPORT_REPLICA_LAG=5)
+    def test_replica_reads_settle_after_the_lag(self):
+        now = clock.time_ns()
+
+        self.assertFalse(report_data_settled(now))
+        self.assertFalse(report_data_settled(now - 4_000_000_000))
+        self.assertTrue(report_data_settled(now - 6_000_000_000))
+
+    @override_settings(REPORT_DATABASE='replica', REPORT_REPLICA_LAG=5)
+    def test_reports_are_not_cached_under_a_fresh_version(self):
+        # get_line_numbers reads the default database, which stands in for a
+        # replica that has caught up
+        url = '/api/logs/line-numbers/?from_date=2025-03-01&to_date=2025-03-31'
+        create_log(LINE_NUMB=1)
+        bump_report_data_version()
+        self.assertEqual(APIClient().get(url).data['line_numbers'], [1])
+
+        create_log(LINE_NUMB=2)
+        self.assertEqual(APIClient().get(url).data['line_numbers'], [1, 2])
+
+
+def create_report_logs():
+    """
+    Logs of a registered operator on two lines for the report tests.
+
+    Line 1 (machines 1 and 2): 2h20m sewing (8400 s) and 1h idle on one day.
+    Line 2 (machine 3): 1h and 1h20m sewing (3600 s + 4800 s) on two days and
+    30m no feeding.
+    """
+    Operator.objects.create(rfid_card_no='1001', operator_name='Asha')
+    logs = (
+        # LINE_NUMB, MACHINE_ID, DATE, START_TIME, END_TIME, MODE, STITCH_COUNT, NEEDLE_RUNTIME, RESERVE
+        (1, 1, date(2025, 3, 4), time(11, 0), time(13, 20), 1, 1000, 3600.0, '3000'),
+        (1, 2, date(2025, 3, 4), time(14, 0), time(15, 0), 2, 0, 0.0, '0'),
+        (2, 3, date(2025, 3, 4), time(9, 0), time(10, 0), 1, 500, 900.0, '2000'),
+        (2, 3, date(2025, 3, 4), time(12, 0), time(12, 30), 3, 0, 0.0, 'abc'),
+        (2, 3, date(2025, 3, 5), time(9, 0), time(10, 20), 1, 700, 1800.0, '1000'),
+        # Not counted: inside a break, after working hours, unregistered operator
+        (1, 1, date(2025, 3, 4), time(10, 30), time(10, 40), 1, 90, 600.0, '3000'),
+        (2, 3, date(2025, 3, 5), time(20, 0), time(21, 0), 1, 90, 3600.0, '3000'),
+    )
+    for line, machine, day, start, end, mode, stitches, needle_runtime, reserve in logs:
+        create_log(
+            LINE_NUMB=line, MACHINE_ID=machine, DATE=day, START_TIME=start, END_TIME=end, MODE=mode,
+            STITCH_COUNT=stitches, NEEDLE_RUNTIME=needle_runtime, RESERVE=reserve,
+        )
+    create_log(LINE_NUMB=1, OPERATOR_ID='2002', NEEDLE_RUNTIME=3600.0)
+
+
+class AllLinesReportTests(TestCase):
+    url = '/api/line-reports/all/'
+
+    @classmethod
+    def setUpTestData(cls):
+        create_report_logs()
+
+    def setUp(self):
+        self.report = APIClient().get(self.url).data
+
+    def test_needle_runtime_percentage_per_line(self):
+        line_1, line_2 = self.report['allLinesReport']
+
+        # 3600 s = 1 h of 2h20m sewing; 2700 s = 45 m of 2h20m sewing
+        self.assertEqual(line_1['needleRuntimePercentage'], 42.86)
+        self.assertEqual(line_2['needleRuntimePercentage'], 32.14)
+        # Average needle runtime per sewing log
+        self.assertEqual((line_1['totalNeedleRuntime'], line_2['totalNeedleRuntime']), (3600, 1350))
+
+    def test_summary_needle_runtime_percentage_uses_the_raw_sums(self):
+        summary = self.report['summary']
+
+        # 6300 s = 1h45m of 4h40m sewing across both lines
+        self.assertEqual(summary['needleRuntimePercentage'], 37.5)
+        self.assertEqual(summary['totalNeedleRuntime'], 4950)
+
+    def test_line_totals(self):
+        line_1, line_2 = self.report['allLinesReport']
+
+        self.assertEqual(
+            (line_1['totalHours'], line_1['totalProductiveTime'], line_1['totalIdealHours'], line_1['utilizationPercentage']),
+            (3.33, {'hours': 2.33, 'percentage': 70.0}, 1.0, 333.33),
+        )
+        self.assertEqual((line_1['totalWorkingDays'], line_1['averageMachines'], line_1['averageSewingSpeed']), (1, 2.0, 3000.0))
+        self.assertEqual(line_2['totalNonProductiveTime'], {
+            'hours': 0.5, 'percentage': 17.65,
+            'breakdown': {'noFeedingHours': 0.5, 'meetingHours': 0.0, 'maintenanceHours': 0.0, 'idleHours': 0.0},
+        })
+        # RESERVE 'abc' isn't a speed, so only 2000 and 1000 are averaged
+        self.assertEqual((line_2['totalWorkingDays'], line_2['averageSewingSpeed'], line_2['totalStitchCount']), (2, 1500.0, 1200))
+
+    def test_line_table_rows(self):
+        first_day = self.report['allLinesReport'][1]['tableData'][0]
+
+        self.assertEqual(first_day, {
+            'Date': '2025-03-04', 'Sewing Hours (PT)': 1.0, 'No Feeding Hours': 0.5, 'Meeting Hours': 0.0,
+            'Maintenance Hours': 0.0, 'Idle Hours': 0.0, 'Total Hours': 1.5, 'Productive Time (PT) %': 66.67,
+            'Non-Productive Time (NPT) %': 33.33, 'Sewing Speed': 1000.0, 'Stitch Count': 500,
+            'Needle Runtime': 900.0, 'Machine Count': 1,
+        })
+
+    def test_summary_totals_are_raw_sums(self):
+        summary = self.report['summary']
+
+        # Summing the rounded per-line figures would give 6.16 and 4.66 hours
+        self.assertEqual(summary['totalHours'], 6.17)
+        self.assertEqual(summary['totalProductiveTime'], {'hours': 4.67, 'percentage': 75.68})
+        self.assertEqual(summary['totalNonProductiveTime'], {'hours': 1.5, 'percentage': 24.32})
+        self.assertEqual((summary['totalIdealHours'], summary['utilizationPercentage']), (1.0, 616.67))
+        self.assertEqual(summary['totalStitchCount'], 2200)
+
+    def test_summary_combines_per_line_figures(self):
+        summary = self.report['summary']
+
+        self.assertEqual((summary['totalLines'], summary['totalWorkingDays'], summary['averageMachines']), (2, 2, 1.5))
+        # Line speeds weighted by line hours: (3000 * 3.33 + 1500 * 2.83) / 6.16
+        self.assertEqual(summary['averageSewingSpeed'], 2310.88)
+
+
+class MachineReportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_report_logs()
+
+    def test_machine_report(self):
+        response = APIClient().get('/api/api/machines/3/reports/')
+
+        self.assertEqual(response['Content-Type'], 'application/json')
+        report = json.loads(response.content)
+        self.assertEqual(
+            (report['totalWorkingDays'], report['totalAvailableHours'], report['totalHours']), (2, 22, 2.83)
+        )
+        self.assertEqual(report['totalProductiveTime'], {'hours': 2.33, 'percentage': 82.35})
+        self.assertEqual((report['totalStitchCount'], report['totalNeedleRuntime']), (1200, 2700.0))
+
+    def test_other_media_types_are_still_negotiated(self):
+        response = APIClient().get('/api/api/machines/3/reports/', HTTP_ACCEPT='text/html')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
+
+
+def create_operator_logs():
+    """
+    Needle runtime for the operator report tests: operator 1001 sews 100 s
+    and idles 50 s on two machines on 4 March, and spends 25 s in a meeting
+    and 25 s without feeding on 5 March; unregistered operator 2002 sews 80 s.
+    """
+    Operator.objects.create(rfid_card_no='1001', operator_name='Asha')
+    logs = (
+        # OPERATOR_ID, MACHINE_ID, DATE, MODE, NEEDLE_RUNTIME, STITCH_COUNT, RESERVE
+        ('1001', 1, date(2025, 3, 4), 1, 100.0, 10, '2000'),
+        ('1001', 2, date(2025, 3, 4), 2, 50.0, 0, '0'),
+        ('1001', 1, date(2025, 3, 5), 4, 25.0, 0, 'x'),
+        ('1001', 1, date(2025, 3, 5), 3, 25.0, 0, 'x'),
+        ('2002', 3, date(2025, 3, 4), 1, 80.0, 40, '1500'),
+        ('0', 3, date(2025, 3, 4), 2, 60.0, 0, '0'),
+    )
+    for operator_id, machine, day, mode, needle_runtime, stitches, reserve in logs:
+        create_log(
+            OPERATOR_ID=operator_id, MACHINE_ID=machine, DATE=day, MODE=mode,
+            NEEDLE_RUNTIME=needle_runtime, STITCH_COUNT=stitches, RESERVE=reserve,
+        )
+
+
+class OperatorReportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_operator_logs()
+
+    def get_report(self, operator_id, query=''):
+        return operator_report(APIRequestFactory().get(f'/operator_report/{operator_id}/{query}'), operator_id).data
+
+    def test_totals(self):
+        report = self.get_report('1001')
+
+        self.assertEqual((report['operator_name'], report['total_hours'], report['total_stitch_count']), ('Asha', 200.0, 10))
+        self.assertEqual(report['total_productive_time'], {'hours': 100.0, 'percentage': 50.0})
+        self.assertEqual(report['total_non_productive_time'], {
+            'hours': 100.0, 'percentage': 50.0,
+            'breakdown': {'no_feeding_hours': 25.0, 'meeting_hours': 25.0, 'maintenance_hours': 0.0, 'idle_hours': 50.0},
+        })
+
+    def test_daily_rows(self):
+        first_day, second_day = self.get_report('1001')['table_data']
+
+        self.assertEqual(first_day, {
+            'Date': date(2025, 3, 4), 'Sewing Hours (PT)': 100.0, 'No Feeding Hours': 0.0, 'Meeting Hours': 0.0,
+            'Maintenance Hours': 0.0, 'Idle Hours': 50.0, 'Total Hours': 150.0, 'Productive Time (PT) %': 66.67,
+            'Non-Productive Time (NPT) %': 33.33, 'Sewing Speed': 1000.0, 'Stitch Count': 10, 'Machine Count': 2,
+        })
+        # A day without sewing, and without a numeric speed
+        self.assertEqual(
+            (second_day['Sewing Hours (PT)'], second_day['Total Hours'], second_day['Productive Time (PT) %'],
+             second_day['Non-Productive Time (NPT) %'], second_day['Sewing Speed']),
+            (0.0, 50.0, 0.0, 100.0, 0.0),
+        )
+
+    def test_date_range(self):
+        report = self.get_report('1001', '?from_date=2025-03-05&to_date=2025-03-05')
+
+        self.assertEqual((report['total_hours'], len(report['table_data'])), (50.0, 1))
+        self.assertEqual(report['total_productive_time'], {'hours': 0.0, 'percentage': 0})
+
+    def test_operator_without_logs(self):
+        report = self.get_report('3003')
+
+        self.assertEqual((report['operator_name'], report['total_hours'], report['table_data']), ('', 0.0, []))
+
+
+class AllOperatorsReportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_operator_logs()
+
+    def get_report(self, query):
+        return all_operators_report(APIRequestFactory().get(f'/all_operators_report/{query}'))
+
+    def test_one_row_per_operator(self):
+        rows = self.get_report('?from_date=2025-03-01&to_date=2025-03-31').data['allOperatorsReport']
+
+        # Operator "0" (nobody logged in) is left out
+        self.assertEqual(sorted(rows, key=lambda row: row['operator_id']), [
+            {'operator_id': '1001', 'operator_name': 'Asha', 'total_hours': 200.0, 'productive_hours': 100.0,
+             'productive_percentage': 50.0, 'stitch_count': 10, 'machine_count': 2},
+            {'operator_id': '2002', 'operator_name': '', 'total_hours': 80.0, 'productive_hours': 80.0,
+             'productive_percentage': 100.0, 'stitch_count': 40, 'machine_count': 1},
+        ])
+
+    def test_date_range(self):
+        rows = self.get_report('?from_date=2025-03-05&to_date=2025-03-05').data['allOperatorsReport']
+
+        self.assertEqual(rows, [
+            {'operator_id': '1001', 'operator_name': 'Asha', 'total_hours': 50.0, 'productive_hours': 0.0,
+             'productive_percentage': 0, 'stitch_count': 0, 'machine_count': 1},
+        ])
+
+    def test_both_dates_are_required(self):
+        self.assertEqual(self.get_report('?from_date=2025-03-01').status_code, 400)
+
+
+class ConsolidatedLogsTests(TestCase):
+    url = '/api/get_consolidated_logs/'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.mode_message = ModeMessage.objects.create(mode=1, message='Sewing')
+        create_log(MODE=1, DATE=date(2025, 3, 4))
+        create_log(MODE=2, DATE=date(2025, 3, 5))
+
+    def test_rows_are_indexed_newest_date_first(self):
+        rows = json.loads(b''.join(self.client.get(self.url).streaming_content))
+
+        self.assertEqual(
+            [(row['index'], row['DATE'], row['mode_description']) for row in rows],
+            [(1, '2025-03-05', 'N/A'), (2, '2025-03-04', 'Sewing')],
+        )
+
+    def test_not_modified_until_the_report_data_changes(self):
+        etag = self.client.get(self.url)['ETag']
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        bump_report_data_version()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_mode_message_changes_change_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.mode_message.message = 'Stitching'
+        self.mode_message.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        rows = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(rows[1]['mode_description'], 'Stitching')
+
+
+class IdListTests(TestCase):
+    def test_machine_ids_are_sorted_and_cached(self):
+        url = '/api/logs/machine-ids/?from_date=2025-03-01&to_date=2025-03-31'
+        for machine_id in (7, 3, 7, 1):
+            create_log(MACHINE_ID=machine_id)
+        create_log(MACHINE_ID=9, DATE=date(2025, 4, 1))
+        self.assertEqual(APIClient().get(url).data, {'machine_ids': [1, 3, 7]})
+
+        create_log(MACHINE_ID=5)
+        self.assertEqual(APIClient().get(url).data, {'machine_ids': [1, 3, 7]})
+
+    def test_dates_are_required(self):
+        self.assertEqual(APIClient().get('/api/logs/machine-ids/').status_code, 400)
+
+
+class ReserveNumericTests(TestCase):
+    def reserve_numeric(self, reserve):
+        return generated_value(create_log(RESERVE=reserve), 'RESERVE_NUMERIC')
+
+    def test_whole_numbers(self):
+        self.assertEqual(self.reserve_numeric('2500'), 2500)
+        self.assertEqual(self.reserve_numeric(' 42 '), 42)
+        self.assertEqual(self.reserve_numeric('-3'), -3)
+        self.assertEqual(self.reserve_numeric('007'), 7)
+        self.assertEqual(self.reserve_numeric('999999999'), 999999999)
+
+    def test_null_for_anything_else(self):
+        # Ten digits could overflow the integer column, so they're rejected too
+        for reserve in ('abc', '', None, '12.5', '12abc', '+5', '9999999999'):
+            with self.subTest(reserve=reserve):
+                self.assertIsNone(self.reserve_numeric(reserve))
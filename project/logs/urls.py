@@ -3,6 +3,7 @@ from .views import *
 
 urlpatterns = [
     path('log/', log_machine_data, name='log-machine-data'),
+    path('log/bulk/', log_machine_data_bulk, name='log-machine-data-bulk'),
     path('logs/', get_machine_logs, name='get-machine-logs'),
     path('get_consolidated_logs/', get_consolidated_logs, name='get_consolidated_logs/'),
     path('user_login/', user_login, name='user_login'),
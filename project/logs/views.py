@@ -1,30 +1,43 @@
 # Standard library imports
-from datetime import datetime, timedelta, date
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import groupby
+from operator import itemgetter
 
 # Django imports
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.contrib.auth import authenticate
+from django.db import connections
 from django.db.models import (
     F, Sum, Count, Case, When, Value, FloatField, ExpressionWrapper,
-    Avg, IntegerField, Q, DurationField
+    Avg, IntegerField, Q
 )
-from django.db.models.functions import (
-    ExtractHour, ExtractMinute, ExtractSecond, Cast
-)
-from django.http import JsonResponse
+from django.db.models.functions import Coalesce, Greatest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.cache import cache_page
+from django.views.decorators.http import condition
 
 # Django REST framework imports
 from rest_framework.response import Response
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.authtoken.models import Token
 from rest_framework.views import APIView
 from rest_framework import status
+from rest_framework.settings import api_settings
 
 # Local application imports
-from .models import MachineLog, DuplicateLog, ModeMessage, Operator
+from .cache_utils import bump_report_data_version, get_mode_messages, get_operators, report_etag
+from .decorators import cached_report, with_parsed_dates
+from .models import GENERATED_FIELDS, MachineLog, DuplicateLog, ModeMessage, Operator
+from .pagination import MachineLogPagination
+from .renderers import ORJSONRenderer, stream_json_array
 from .serializers import MachineLogSerializer
 
+logger = logging.getLogger(__name__)
+
 # Dictionary to map mode numbers to descriptions
 MODES = {
     1: "Sewing",
@@ -34,6 +47,57 @@ MODES = {
     5: "Maintenance",
 }
 
+# Threads shared by all report requests in a process, bounding the extra
+# connections they open. Only used with a read replica, see run_concurrently
+REPORT_QUERY_WORKERS = 4
+report_query_executor = (
+    ThreadPoolExecutor(max_workers=REPORT_QUERY_WORKERS, thread_name_prefix='report-query')
+    if settings.REPORT_DATABASE != 'default' else None
+)
+
+def run_concurrently(*funcs):
+    """
+    Run independent read-only query callables and return their results in order.
+
+    With a read replica configured they run in parallel on the shared
+    report_query_executor, each call closing the DB connections it opened;
+    otherwise they run one after another in the request thread, so reports
+    open no extra connections to the primary database. Callers pass queries
+    on settings.REPORT_DATABASE, so the threads only connect to the replica.
+    """
+    if report_query_executor is None:
+        return [func() for func in funcs]
+
+    def call(func):
+        try:
+            return func()
+        finally:
+            connections.close_all()
+
+    return list(report_query_executor.map(call, funcs))
+
+def valid_operator_ids():
+    """
+    rfid_card_no of every registered operator, taken from the cached operator
+    list so report filters get a literal IN list instead of a subquery.
+    """
+    return [rfid_card_no for rfid_card_no, _ in get_operators()]
+
+# Seconds to cache the machine/line count and efficiency summary endpoints
+SUMMARY_CACHE_TIMEOUT = 60
+
+# Seconds to cache the line/machine/operator report and id list endpoints (see cached_report)
+REPORT_CACHE_TIMEOUT = 300
+
+# orjson for the large report payloads, ahead of the default renderers so
+# other media types (such as the browsable API) are still negotiated
+REPORT_RENDERER_CLASSES = [ORJSONRenderer, *api_settings.DEFAULT_RENDERER_CLASSES]
+
+# Available hours per working day: the operator shift (8:30 AM to 7:30 PM less
+# breaks) and the machine working window used by the machine reports
+OPERATOR_DAY_HOURS = 10
+MACHINE_DAY_HOURS = 11
+
 @api_view(['POST'])
 def log_machine_data(request):
     """
@@ -45,7 +109,7 @@ def log_machine_data(request):
       - Checks if the adjusted Log ID exists for the same Machine ID and Date before saving.
     """
     data = request.data
-    print("Processing machine log data...")
+    logger.debug("Processing machine log data")
 
     # Validate mode
     try:
@@ -96,17 +160,79 @@ def log_machine_data(request):
             validated_data["Str_LOGID"] = adjusted_str_log_id
 
     # Save the log data
-    MachineLog.objects.create(**validated_data)
+    serializer.save()
 
     return Response({
         "code": 200,
         "message": "Log saved successfully",
     }, status=200)
 
-from rest_framework.decorators import api_view
-from rest_framework.response import Response
-from .models import MachineLog
-from .serializers import MachineLogSerializer
+@api_view(['POST'])
+def log_machine_data_bulk(request):
+    """
+    Bulk variant of log_machine_data for a list of logs.
+
+    Applies the same mode validation and Str_LOGID handling (> 1000 is adjusted
+    and skipped if it already exists for the machine and date), but checks for
+    duplicates with one query and saves all new rows with a single bulk insert.
+    """
+    data = request.data
+    if not isinstance(data, list):
+        return Response({"message": "Expected a list of logs"}, status=400)
+
+    for item in data:
+        try:
+            mode = int(item.get("MODE"))
+        except (AttributeError, TypeError, ValueError):
+            return Response({"message": "Invalid mode format"}, status=400)
+        if mode not in MODES:
+            return Response({"message": f"Invalid mode: {mode}. Valid modes are {list(MODES.keys())}"}, status=400)
+
+    serializer = MachineLogSerializer(data=data, many=True)
+    if not serializer.is_valid():
+        return Response({"message": "Validation failed", "errors": serializer.errors}, status=400)
+
+    validated_items = serializer.validated_data
+
+    # Adjust Str_LOGID the same way as the single-log endpoint
+    adjusted_indexes = set()
+    for index, item in enumerate(validated_items):
+        str_log_id = item.get("Str_LOGID")
+        if str_log_id is not None and str_log_id > 1000:
+            item["Str_LOGID"] = str_log_id - 1000
+            adjusted_indexes.add(index)
+    adjusted_items = [validated_items[index] for index in adjusted_indexes]
+
+    # Fetch existing adjusted Str_LOGIDs for the affected machines/dates in one query
+    existing = set()
+    if adjusted_items:
+        existing = set(MachineLog.objects.filter(
+            Str_LOGID__in={item["Str_LOGID"] for item in adjusted_items},
+            MACHINE_ID__in={item["MACHINE_ID"] for item in adjusted_items},
+            DATE__in={item["DATE"] for item in adjusted_items}
+        ).values_list('Str_LOGID', 'MACHINE_ID', 'DATE'))
+
+    new_logs = []
+    skipped = 0
+    for index, item in enumerate(validated_items):
+        if index in adjusted_indexes:
+            key = (item["Str_LOGID"], item["MACHINE_ID"], item["DATE"])
+            if key in existing:
+                skipped += 1
+                continue
+            existing.add(key)
+        new_logs.append(MachineLog(**item))
+
+    MachineLog.objects.bulk_create(new_logs, batch_size=500)
+    if new_logs:
+        bump_report_data_version()
+
+    return Response({
+        "code": 200,
+        "message": "Logs saved successfully",
+        "saved": len(new_logs),
+        "skipped": skipped,
+    }, status=200)
 
 @api_view(['GET'])
 def get_machine_logs(request):
@@ -116,14 +242,27 @@ def get_machine_logs(request):
     from_date = request.query_params.get('from_date')
     to_date = request.query_params.get('to_date')
     
-    logs = MachineLog.objects.all().order_by('-created_at')
+    logs = MachineLog.objects.defer(*GENERATED_FIELDS).order_by('-created_at')
     
     if from_date:
         logs = logs.filter(DATE__gte=from_date)
     if to_date:
         logs = logs.filter(DATE__lte=to_date)
     
-    serialized_logs = MachineLogSerializer(logs, many=True).data
+    # Paginate when a page is requested, so only one page is loaded and serialized
+    if 'page' in request.query_params:
+        paginator = MachineLogPagination()
+        page = paginator.paginate_queryset(logs, request)
+        serialized_logs = MachineLogSerializer(page, many=True).data
+
+        # Add indexing (continuing from the page offset)
+        start = paginator.page.start_index()
+        for idx, log in enumerate(serialized_logs, start=start):
+            log['index'] = idx
+
+        return paginator.get_paginated_response(serialized_logs)
+
+    serialized_logs = MachineLogSerializer(logs.iterator(chunk_size=2000), many=True).data
 
     # Add indexing (starting from 1)
     for idx, log in enumerate(serialized_logs, start=1):
@@ -181,22 +320,64 @@ def get_underperforming_operators(request):
 
     return Response({"underperforming_operator_count": underperforming_count}, status=200)
 
+def distinct_count(model, field_name, estimate=False):
+    """
+    Number of distinct values of `field_name` in `model`'s table.
+
+    Exact by default. With `estimate` set on PostgreSQL it reads the planner's
+    pg_stats estimate (kept up to date by ANALYZE/autovacuum) instead of
+    scanning the table, falling back to the exact COUNT(DISTINCT) when no
+    usable statistics are available.
+    """
+    connection = connections[settings.REPORT_DATABASE]
+    if estimate and connection.vendor == 'postgresql':
+        table = model._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT s.n_distinct, c.reltuples
+                FROM pg_stats s, pg_class c
+                WHERE c.oid = %s::regclass
+                  AND s.schemaname = current_schema()
+                  AND s.tablename = %s
+                  AND s.attname = %s
+                """,
+                [table, table, model._meta.get_field(field_name).column]
+            )
+            row = cursor.fetchone()
+        if row is not None:
+            n_distinct, reltuples = row
+            # A negative n_distinct is a fraction of the row count
+            if n_distinct < 0 and reltuples > 0:
+                n_distinct = -n_distinct * reltuples
+            if n_distinct > 0:
+                return round(n_distinct)
+
+    return model.objects.using(settings.REPORT_DATABASE).order_by().values(field_name).distinct().count()
+
+@cache_page(SUMMARY_CACHE_TIMEOUT)
 @api_view(['GET'])
 def get_machine_id_count(request):
     """
-    Fetch total number of unique Machine IDs.
+    Fetch total number of unique Machine IDs (pass `estimate=true` for a
+    cheaper estimate from the table statistics on PostgreSQL).
     """
-    machine_count = MachineLog.objects.values("MACHINE_ID").distinct().count()
+    estimate = request.GET.get('estimate', '').lower() == 'true'
+    machine_count = distinct_count(MachineLog, 'MACHINE_ID', estimate=estimate)
     return Response({"machine_id_count": machine_count}, status=200)
 
+@cache_page(SUMMARY_CACHE_TIMEOUT)
 @api_view(['GET'])
 def get_line_number_count(request):
     """
-    Fetch total number of unique Line Numbers.
+    Fetch total number of unique Line Numbers (pass `estimate=true` for a
+    cheaper estimate from the table statistics on PostgreSQL).
     """
-    line_count = MachineLog.objects.values("LINE_NUMB").distinct().count()
+    estimate = request.GET.get('estimate', '').lower() == 'true'
+    line_count = distinct_count(MachineLog, 'LINE_NUMB', estimate=estimate)
     return Response({"line_number_count": line_count}, status=200)
 
+@cache_page(SUMMARY_CACHE_TIMEOUT)
 @api_view(['GET'])
 def calculate_line_efficiency(request):
     """
@@ -208,7 +389,7 @@ def calculate_line_efficiency(request):
         - Runtime efficiency percentage
     """
     line_stats = (
-        MachineLog.objects.values("LINE_NUMB")
+        MachineLog.objects.using(settings.REPORT_DATABASE).values("LINE_NUMB")
         .annotate(
             total_machines=Count("MACHINE_ID", distinct=True),
             total_runtime=Sum("NEEDLE_RUNTIME"),
@@ -232,10 +413,6 @@ def calculate_line_efficiency(request):
 
     return Response(response)
 
-def time_to_seconds(time_obj):
-    """Helper function to convert HH:MM:SS TimeField to total seconds."""
-    return time_obj.hour * 3600 + time_obj.minute * 60 + time_obj.second
-
 @api_view(['GET'])
 def calculate_operator_efficiency(request):
     """
@@ -244,30 +421,30 @@ def calculate_operator_efficiency(request):
     Returns:
         Response with efficiency percentage for each operator
     """
-    logs = MachineLog.objects.values("OPERATOR_ID", "START_TIME", "END_TIME")
-
-    response = []
     standard_work_time = 8 * 3600  # 8 hours in seconds
 
-    for log in logs:
-        operator_id = log["OPERATOR_ID"]
-        start_time = log["START_TIME"]
-        end_time = log["END_TIME"]
-
-        start_seconds = time_to_seconds(start_time)
-        end_seconds = time_to_seconds(end_time)
-
+    logs = MachineLog.objects.alias(
         # Handle cases where END_TIME is on the next day
-        if end_seconds < start_seconds:
-            end_seconds += 24 * 3600  # Add 24 hours in seconds
-
-        actual_work_time = end_seconds - start_seconds
-        efficiency = (actual_work_time / standard_work_time) * 100 if standard_work_time > 0 else 0
+        actual_work_time=Case(
+            When(END_SECONDS__lt=F('START_SECONDS'),
+                 then=F('END_SECONDS') + Value(24 * 3600) - F('START_SECONDS')),
+            default=F('END_SECONDS') - F('START_SECONDS'),
+            output_field=IntegerField()
+        )
+    ).annotate(
+        efficiency=ExpressionWrapper(
+            F('actual_work_time') * Value(100.0) / Value(float(standard_work_time)),
+            output_field=FloatField()
+        )
+    ).values_list("OPERATOR_ID", "efficiency")
 
-        response.append({
+    response = [
+        {
             "operator": f"Operator {operator_id}",
             "efficiency": round(efficiency, 2)
-        })
+        }
+        for operator_id, efficiency in logs
+    ]
 
     return Response(response)
 
@@ -276,11 +453,60 @@ class MachineLogListView(APIView):
     API View to list all machine logs.
     """
     def get(self, request, format=None):
-        machine_logs = MachineLog.objects.all()
-        serializer = MachineLogSerializer(machine_logs, many=True)
+        machine_logs = MachineLog.objects.defer(*GENERATED_FIELDS)
+        serializer = MachineLogSerializer(machine_logs.iterator(chunk_size=2000), many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+def round_values(values, ndigits=2):
+    """Round a sequence of floats to `ndigits` decimal places."""
+    return [round(value, ndigits) for value in values]
+
+def daily_share_annotations():
+    """
+    Per-date total hours and PT/NPT percentages, derived in the database from
+    the mode-hour columns of the line/machine daily aggregates so the table
+    rows need no per-row arithmetic in Python.
+    """
+    return dict(
+        daily_total_hours=(
+            F('sewing_hours') + F('no_feeding_hours') + F('meeting_hours') +
+            F('maintenance_hours') + F('idle_hours')
+        ),
+        productive_time_percentage=Case(
+            When(daily_total_hours__gt=0, then=F('sewing_hours') * 100.0 / F('daily_total_hours')),
+            default=Value(0.0),
+            output_field=FloatField()
+        ),
+        non_productive_time_percentage=Case(
+            When(daily_total_hours__gt=0, then=(F('daily_total_hours') - F('sewing_hours')) * 100.0 / F('daily_total_hours')),
+            default=Value(0.0),
+            output_field=FloatField()
+        ),
+    )
+
+OPERATOR_TABLE_COLUMNS = (
+    'Date',
+    'Operator ID',
+    'Operator Name',
+    'Total Hours',
+    'Sewing Hours',
+    'Idle Hours',
+    'Meeting Hours',
+    'No Feeding Hours',
+    'Maintenance Hours',
+    'Productive Time in %',
+    'NPT in %',
+    'Sewing Speed',
+    'Stitch Count',
+    'Needle Runtime',
+)
+
+# Positions of the float columns in an operator table row (as fetched) that are rounded for output
+OPERATOR_ROUNDED_COLUMNS = slice(2, 11)
+
 @api_view(['GET'])
+@cached_report(REPORT_CACHE_TIMEOUT)
+@with_parsed_dates
 def operator_reports_by_name(request, operator_name):
     """
     Generate detailed performance report for a specific operator.
@@ -300,155 +526,33 @@ def operator_reports_by_name(request, operator_name):
     """
     try:
         if operator_name=="All":
-            operator = Operator.objects.all( )
-            logs = MachineLog.objects.all()
+            logs = MachineLog.objects.using(settings.REPORT_DATABASE).all()
         else:
-            # Fetch operator by name
-            operator = Operator.objects.get(operator_name=operator_name)
-            logs = MachineLog.objects.filter(OPERATOR_ID=operator.rfid_card_no)    
+            # Fetch the operator's card number by name
+            operator_id = Operator.objects.values_list('rfid_card_no', flat=True).get(operator_name=operator_name)
+            logs = MachineLog.objects.using(settings.REPORT_DATABASE).filter(OPERATOR_ID=operator_id)    
        
     except Operator.DoesNotExist:
         return Response({"error": "Operator not found"}, status=404)
 
-    # Get date filters from query parameters
-    from_date_str = request.GET.get('from_date', '')
-    to_date_str = request.GET.get('to_date', '')
+    from_date, to_date = request.from_date, request.to_date
 
     # Apply date filtering if dates are provided
-    if from_date_str:
-        from_date = datetime.strptime(from_date_str, '%Y-%m-%d').date()
+    if from_date:
         logs = logs.filter(DATE__gte=from_date)
 
-    if to_date_str:
-        to_date = datetime.strptime(to_date_str, '%Y-%m-%d').date()
+    if to_date:
         logs = logs.filter(DATE__lte=to_date)
 
     # Exclude records where OPERATOR_ID is 0 AND MODE is 2
-    logs = logs.exclude(Q(OPERATOR_ID=0) & Q(MODE=2))
-
-    # Calculate duration in hours for each log entry with time constraints (8:30 AM to 7:30 PM)
-    logs = logs.annotate(
-        start_seconds=ExpressionWrapper(
-            ExtractHour('START_TIME') * 3600 + 
-            ExtractMinute('START_TIME') * 60 + 
-            ExtractSecond('START_TIME'),
-            output_field=FloatField()
-        ),
-        end_seconds=ExpressionWrapper(
-            ExtractHour('END_TIME') * 3600 + 
-            ExtractMinute('END_TIME') * 60 + 
-            ExtractSecond('END_TIME'),
-            output_field=FloatField()
-        ),
-        # Calculate adjusted start and end times within working hours (8:30 AM to 7:30 PM)
-        adjusted_start_seconds=Case(
-            When(start_seconds__lt=8.5*3600, then=Value(8.5*3600)),  # 8:30 AM
-            When(start_seconds__gt=19.5*3600, then=Value(19.5*3600)),  # 7:30 PM
-            default=F('start_seconds'),
-            output_field=FloatField()
-        ),
-        adjusted_end_seconds=Case(
-            When(end_seconds__lt=8.5*3600, then=Value(8.5*3600)),  # 8:30 AM
-            When(end_seconds__gt=19.5*3600, then=Value(19.5*3600)),  # 7:30 PM
-            default=F('end_seconds'),
-            output_field=FloatField()
-        ),
-        # Calculate duration only for the time within working hours
-        duration_hours=Case(
-            # Case when both start and end are outside working hours
-            When(
-                Q(end_seconds__lte=8.5*3600) | Q(start_seconds__gte=19.5*3600),
-                then=Value(0)
-            ),
-            # Case when log spans working hours
-            default=ExpressionWrapper(
-                (F('adjusted_end_seconds') - F('adjusted_start_seconds')) / 3600,
-                output_field=FloatField()
-            ),
-            output_field=FloatField()
-        ),
-        reserve_numeric=Cast('RESERVE', output_field=IntegerField())
-    ).filter(duration_hours__gt=0)  # Only include logs with positive duration within working hours
-
-    # Filter out break times
-    logs = logs.exclude(
-        Q(start_seconds__gte=10.5*3600, end_seconds__lte=10.6667*3600) |  # 10:30-10:40
-        Q(start_seconds__gte=13.3333*3600, end_seconds__lte=14*3600) |    # 13:20-14:00
-        Q(start_seconds__gte=16.3333*3600, end_seconds__lte=16.5*3600)    # 16:20-16:30
-    )
-
-    # Calculate total working days and available hours (10 hours per day accounting for breaks)
-    total_working_days = logs.values('DATE').distinct().count()
-    total_available_hours = total_working_days * 10  # 10 hours per working day
-
-    # Calculate total hours for each mode
-    mode_hours = logs.values('MODE').annotate(
-        total_hours=Sum('duration_hours')
-    )
-
-    # Initialize hour counters
-    total_production_hours = 0
-    total_meeting_hours = 0
-    total_no_feeding_hours = 0
-    total_maintenance_hours = 0
-
-    # Sum hours for each mode
-    for mode in mode_hours:
-        if mode['MODE'] == 1:  # Sewing (Production)
-            total_production_hours = mode['total_hours'] or 0
-        elif mode['MODE'] == 4:  # Meeting
-            total_meeting_hours = mode['total_hours'] or 0
-        elif mode['MODE'] == 3:  # No Feeding
-            total_no_feeding_hours = mode['total_hours'] or 0
-        elif mode['MODE'] == 5:  # Maintenance
-            total_maintenance_hours = mode['total_hours'] or 0
-
-    # Calculate total idle hours
-    total_idle_hours = max(total_available_hours - (
-        total_production_hours + 
-        total_no_feeding_hours + 
-        total_meeting_hours + 
-        total_maintenance_hours
-    ), 0)
+    logs = logs.exclude(Q(OPERATOR_ID="0") & Q(MODE=2))
 
-    # Calculate non-productive time components
-    total_non_production_hours = (
-        total_no_feeding_hours + 
-        total_meeting_hours + 
-        total_maintenance_hours + 
-        total_idle_hours
-    )
-
-    # Calculate percentages
-    production_percentage = (total_production_hours / total_available_hours * 100) if total_available_hours > 0 else 0
-    npt_percentage = (total_non_production_hours / total_available_hours * 100) if total_available_hours > 0 else 0
-
-    # Calculate Average Sewing Speed
-    valid_speed_logs = logs.filter(reserve_numeric__gt=0)
-    average_sewing_speed = valid_speed_logs.aggregate(
-        avg_speed=Avg('reserve_numeric')
-    )['avg_speed'] or 0
-
-    # Calculate total stitch count
-    total_stitch_count = logs.aggregate(
-        total=Sum('STITCH_COUNT', default=0)
-    )['total'] or 0
-
-    # Calculate Needle Runtime metrics
-    sewing_logs = logs.filter(MODE=1)  # Only sewing mode logs
-    total_needle_runtime = sewing_logs.aggregate(
-        total_runtime=Sum('NEEDLE_RUNTIME', default=0)
-    )['total_runtime'] or 0
-    
-    needle_runtime_instances = sewing_logs.count()
-    average_needle_runtime = total_needle_runtime / needle_runtime_instances if needle_runtime_instances > 0 else 0
-    
-    # Convert needle runtime from seconds to hours for percentage calculation
-    total_needle_runtime_hours = total_needle_runtime / 3600
-    needle_runtime_percentage = (total_needle_runtime_hours / total_production_hours * 100) if total_production_hours > 0 else 0
+    # Duration within working hours (8:30 AM to 7:30 PM), precomputed by the database
+    # as SHIFT_SECONDS; it is NULL for logs outside working hours or within a break
+    logs = logs.in_shift()
 
     # Fetch Table Data (daily breakdown)
-    table_data = logs.values('DATE', 'OPERATOR_ID').annotate(
+    table_query = logs.values('DATE', 'OPERATOR_ID').annotate(
     sewing_hours=Sum(Case(
         When(MODE=1, then=F('duration_hours')),
         default=Value(0),
@@ -471,48 +575,98 @@ def operator_reports_by_name(request, operator_name):
     )),
     total_stitch_count=Sum('STITCH_COUNT'),
     sewing_speed=Avg(Case(
-        When(reserve_numeric__gt=0, then=F('reserve_numeric')),
+        When(RESERVE_NUMERIC__gt=0, then=F('RESERVE_NUMERIC')),
         default=Value(0),
         output_field=FloatField()
     )),
     needle_runtime=Sum('NEEDLE_RUNTIME')
     ).annotate(
-    total_hours=Value(10, output_field=FloatField()),
-    idle_hours=Value(10, output_field=FloatField()) - 
-             (F('sewing_hours') + F('meeting_hours') + 
-              F('no_feeding_hours') + F('maintenance_hours')),
-    productive_time_percentage=(F('sewing_hours') / 10) * 100,
-    npt_percentage=100 - (F('sewing_hours') / 10) * 100
-    ).order_by('DATE', 'OPERATOR_ID')
-
-# Now format the data, fetching operator name from the Operator model
-    formatted_table_data = []
-    for data in table_data:
-    # Get operator details from the Operator model
-        try:
-            operator = Operator.objects.get( rfid_card_no=data['OPERATOR_ID'])
-            operator_name = operator.operator_name # Assuming the name field is called 'name'
-            rfid_card_no = operator.rfid_card_no  # Get RFID card number if needed
-        except Operator.DoesNotExist:
-            operator_name = "Unknown"
-            rfid_card_no = "Unknown"
+    total_hours=Value(OPERATOR_DAY_HOURS, output_field=FloatField()),
+    idle_hours=Greatest(
+        Value(OPERATOR_DAY_HOURS, output_field=FloatField()) -
+        (F('sewing_hours') + F('meeting_hours') +
+         F('no_feeding_hours') + F('maintenance_hours')),
+        Value(0, output_field=FloatField())
+    ),
+    productive_time_percentage=(F('sewing_hours') / OPERATOR_DAY_HOURS) * 100,
+    npt_percentage=100 - (F('sewing_hours') / OPERATOR_DAY_HOURS) * 100
+    ).order_by('DATE', 'OPERATOR_ID').values_list(
+        'DATE', 'OPERATOR_ID', 'total_hours', 'sewing_hours', 'idle_hours', 'meeting_hours',
+        'no_feeding_hours', 'maintenance_hours', 'productive_time_percentage', 'npt_percentage',
+        'sewing_speed', 'total_stitch_count', 'needle_runtime'
+    )
+
+    # The totals (working days, mode hours, sewing speed, stitch count and needle
+    # runtime) and the daily table are independent queries, so run them concurrently
+    totals, table_data = run_concurrently(
+        lambda: logs.aggregate(
+            working_days=Count('DATE', distinct=True),
+            production_hours=Sum('duration_hours', filter=Q(MODE=1)),  # Sewing (Production)
+            no_feeding_hours=Sum('duration_hours', filter=Q(MODE=3)),
+            meeting_hours=Sum('duration_hours', filter=Q(MODE=4)),
+            maintenance_hours=Sum('duration_hours', filter=Q(MODE=5)),
+            avg_speed=Avg('RESERVE_NUMERIC', filter=Q(RESERVE_NUMERIC__gt=0)),
+            stitch_count=Sum('STITCH_COUNT'),
+            needle_runtime=Sum('NEEDLE_RUNTIME', filter=Q(MODE=1)),
+            needle_runtime_instances=Count('id', filter=Q(MODE=1))
+        ),
+        lambda: list(table_query)
+    )
+    total_working_days = totals['working_days']
+    total_available_hours = total_working_days * OPERATOR_DAY_HOURS  # 10 hours per working day (accounting for breaks)
+
+    total_production_hours = totals['production_hours'] or 0
+    total_no_feeding_hours = totals['no_feeding_hours'] or 0
+    total_meeting_hours = totals['meeting_hours'] or 0
+    total_maintenance_hours = totals['maintenance_hours'] or 0
+
+    # Calculate total idle hours
+    total_idle_hours = max(total_available_hours - (
+        total_production_hours + 
+        total_no_feeding_hours + 
+        total_meeting_hours + 
+        total_maintenance_hours
+    ), 0)
+
+    # Calculate non-productive time components
+    total_non_production_hours = (
+        total_no_feeding_hours + 
+        total_meeting_hours + 
+        total_maintenance_hours + 
+        total_idle_hours
+    )
+
+    # Calculate percentages
+    production_percentage = (total_production_hours / total_available_hours * 100) if total_available_hours > 0 else 0
+    npt_percentage = (total_non_production_hours / total_available_hours * 100) if total_available_hours > 0 else 0
+
+    average_sewing_speed = totals['avg_speed'] or 0
+    total_stitch_count = totals['stitch_count'] or 0
+
+    # Calculate Needle Runtime metrics (sewing mode logs only)
+    total_needle_runtime = totals['needle_runtime'] or 0
+    needle_runtime_instances = totals['needle_runtime_instances']
+    average_needle_runtime = total_needle_runtime / needle_runtime_instances if needle_runtime_instances > 0 else 0
     
-        formatted_table_data.append({
-            'Date': str(data['DATE']),
-            'Operator ID': data['OPERATOR_ID'],
-            'Operator Name': operator_name,
-            'Total Hours': round(data['total_hours'], 2),
-            'Sewing Hours': round(data['sewing_hours'], 2),
-            'Idle Hours': round(max(data['idle_hours'], 0), 2),
-            'Meeting Hours': round(data['meeting_hours'], 2),
-            'No Feeding Hours': round(data['no_feeding_hours'], 2),
-            'Maintenance Hours': round(data['maintenance_hours'], 2),
-            'Productive Time in %': round(data['productive_time_percentage'], 2),
-            'NPT in %': round(data['npt_percentage'], 2),
-            'Sewing Speed': round(data['sewing_speed'], 2),
-            'Stitch Count': data['total_stitch_count'],
-            'Needle Runtime': data['needle_runtime']
-        })
+    # Convert needle runtime from seconds to hours for percentage calculation
+    total_needle_runtime_hours = total_needle_runtime / 3600
+    needle_runtime_percentage = (total_needle_runtime_hours / total_production_hours * 100) if total_production_hours > 0 else 0
+
+    # Operator names for the table rows come from the cached operator list
+    operator_names = dict(get_operators())
+
+    # Now format the data, using the operator names looked up above and rounding
+    # the hour/percentage/speed columns in one pass per row
+    formatted_table_data = [
+        dict(zip(OPERATOR_TABLE_COLUMNS, (
+            str(row[0]),
+            row[1],
+            operator_names.get(row[1], "Unknown"),
+            *round_values(row[OPERATOR_ROUNDED_COLUMNS]),
+            *row[OPERATOR_ROUNDED_COLUMNS.stop:]
+        )))
+        for row in table_data
+    ]
 
     return Response({
         "totalProductionHours": round(total_production_hours, 2),
@@ -530,126 +684,75 @@ def operator_reports_by_name(request, operator_name):
         "totalNPT": round(total_non_production_hours, 2)
     })
 
-from django.db.models import Sum, Case, When, Value, FloatField, F, ExpressionWrapper, Q, IntegerField, Avg, Count
-from django.db.models.functions import ExtractHour, ExtractMinute, ExtractSecond, Cast
-from rest_framework.decorators import api_view
-from rest_framework.response import Response
-from datetime import datetime
-from .models import MachineLog
-
-def process_line_data(logs, line_number):
-    """Helper function to process data for a single line"""
-    # Calculate total ideal hours (sum of all Mode 2 durations)
-    ideal_hours_data = logs.filter(MODE=2).aggregate(
-        total_ideal=Sum('duration_hours')
-    )
-    total_ideal_hours = ideal_hours_data['total_ideal'] or 0
-
-    # Get machine counts per day
-    daily_machine_counts = logs.values('DATE').annotate(
-        machine_count=Count('MACHINE_ID', distinct=True)
-    ).order_by('DATE')
-
-    # Calculate total working days and average machines per day
-    total_working_days = len(daily_machine_counts)
-    average_machines = sum(item['machine_count'] for item in daily_machine_counts) / total_working_days if total_working_days > 0 else 0
+LINE_TABLE_COLUMNS = (
+    'Date',
+    'Sewing Hours (PT)',
+    'No Feeding Hours',
+    'Meeting Hours',
+    'Maintenance Hours',
+    'Idle Hours',
+    'Total Hours',
+    'Productive Time (PT) %',
+    'Non-Productive Time (NPT) %',
+    'Sewing Speed',
+    'Stitch Count',
+    'Needle Runtime',
+    'Machine Count',
+)
 
-    # Create a dictionary of date to machine count
-    date_machine_counts = {item['DATE']: item['machine_count'] for item in daily_machine_counts}
+# Positions of the float columns in a line table row that are rounded for output
+LINE_ROUNDED_COLUMNS = slice(1, 10)
 
-    # Get aggregated data by date
-    daily_data = logs.values('DATE').annotate(
-        sewing_hours=Sum(Case(
-            When(MODE=1, then=F('duration_hours')),
-            default=Value(0),
-            output_field=FloatField()
-        )),
-        no_feeding_hours=Sum(Case(
-            When(MODE=3, then=F('duration_hours')),
-            default=Value(0),
-            output_field=FloatField()
-        )),
-        meeting_hours=Sum(Case(
-            When(MODE=4, then=F('duration_hours')),
-            default=Value(0),
-            output_field=FloatField()
-        )),
-        maintenance_hours=Sum(Case(
-            When(MODE=5, then=F('duration_hours')),
-            default=Value(0),
-            output_field=FloatField()
-        )),
-        idle_hours=Sum(Case(
-            When(MODE=2, then=F('duration_hours')),
-            default=Value(0),
-            output_field=FloatField()
-        )),
-        total_stitch_count=Sum('STITCH_COUNT'),
-        sewing_speed=Avg(Case(
-            When(reserve_numeric__gt=0, then=F('reserve_numeric')),
-            default=Value(0),
-            output_field=FloatField()
-        )),
-        needle_runtime=Sum('NEEDLE_RUNTIME')
-    ).order_by('DATE')
+def build_line_report(line_number, totals, daily_data):
+    """
+    Build a line report from that line's range totals (line_totals_aggregates)
+    and its per-date rows (line_daily_aggregates), ordered by date.
+    """
+    total_sewing_hours = totals['sewing_hours'] or 0
+    total_no_feeding_hours = totals['no_feeding_hours'] or 0
+    total_meeting_hours = totals['meeting_hours'] or 0
+    total_maintenance_hours = totals['maintenance_hours'] or 0
+    total_idle_hours = totals['idle_hours'] or 0
+    total_stitch_count = totals['stitch_count'] or 0
+    total_needle_runtime = totals['needle_runtime'] or 0
 
-    # Calculate totals
-    total_sewing_hours = 0
-    total_no_feeding_hours = 0
-    total_meeting_hours = 0
-    total_maintenance_hours = 0
-    total_idle_hours = 0
-    total_stitch_count = 0
-    total_needle_runtime = 0
-    total_hours = 0  # Sum of all actual hours (PT + NPT)
-
-    formatted_table_data = []
-    for data in daily_data:
-        date = data['DATE']
-        machine_count = date_machine_counts.get(date, 1)
-        
-        sewing_hours = data['sewing_hours'] or 0
-        no_feeding_hours = data['no_feeding_hours'] or 0
-        meeting_hours = data['meeting_hours'] or 0
-        maintenance_hours = data['maintenance_hours'] or 0
-        idle_hours = data['idle_hours'] or 0
-        
-        # Calculate PT and NPT
-        productive_time = sewing_hours
-        non_productive_time = no_feeding_hours + meeting_hours + maintenance_hours + idle_hours
-        daily_total_hours = productive_time + non_productive_time
-        
-        # Accumulate to total hours
-        total_hours += daily_total_hours
-        
-        # Calculate percentages
-        productive_time_percentage = (productive_time / daily_total_hours * 100) if daily_total_hours > 0 else 0
-        non_productive_time_percentage = (non_productive_time / daily_total_hours * 100) if daily_total_hours > 0 else 0
-        
-        formatted_table_data.append({
-            'Date': str(date),
-            'Sewing Hours (PT)': round(sewing_hours, 2),
-            'No Feeding Hours': round(no_feeding_hours, 2),
-            'Meeting Hours': round(meeting_hours, 2),
-            'Maintenance Hours': round(maintenance_hours, 2),
-            'Idle Hours': round(idle_hours, 2),
-            'Total Hours': round(daily_total_hours, 2),
-            'Productive Time (PT) %': round(productive_time_percentage, 2),
-            'Non-Productive Time (NPT) %': round(non_productive_time_percentage, 2),
-            'Sewing Speed': round(data['sewing_speed'], 2),
-            'Stitch Count': data['total_stitch_count'],
-            'Needle Runtime': data['needle_runtime'],
-            'Machine Count': machine_count
-        })
+    # Total ideal hours is the sum of all Mode 2 durations
+    total_ideal_hours = total_idle_hours
 
-        # Accumulate totals
-        total_sewing_hours += sewing_hours
-        total_no_feeding_hours += no_feeding_hours
-        total_meeting_hours += meeting_hours
-        total_maintenance_hours += maintenance_hours
-        total_idle_hours += idle_hours
-        total_stitch_count += data['total_stitch_count'] or 0
-        total_needle_runtime += data['needle_runtime'] or 0
+    # Calculate total working days and average machines per day
+    total_working_days = len(daily_data)
+    average_machines = sum(data['machine_count'] for data in daily_data) / total_working_days if total_working_days > 0 else 0
+
+    # Daily totals and PT/NPT percentages come precomputed from daily_share_annotations
+    table_rows = [
+        (
+            str(data['DATE']),
+            data['sewing_hours'],
+            data['no_feeding_hours'],
+            data['meeting_hours'],
+            data['maintenance_hours'],
+            data['idle_hours'],
+            data['daily_total_hours'],
+            data['productive_time_percentage'],
+            data['non_productive_time_percentage'],
+            data['sewing_speed'],
+            data['total_stitch_count'],
+            data['needle_runtime'],
+            data['machine_count']
+        )
+        for data in daily_data
+    ]
+
+    # Build the row dicts once, after all the per-day arithmetic is done,
+    # rounding the hour/percentage/speed columns in the same pass
+    formatted_table_data = [
+        dict(zip(LINE_TABLE_COLUMNS, (
+            row[0],
+            *round_values(row[LINE_ROUNDED_COLUMNS]),
+            *row[LINE_ROUNDED_COLUMNS.stop:]
+        )))
+        for row in table_rows
+    ]
 
     # Calculate overall PT and NPT
     total_productive_time = total_sewing_hours
@@ -659,21 +762,17 @@ def process_line_data(logs, line_number):
         total_maintenance_hours + 
         total_idle_hours
     )
+    total_hours = total_productive_time + total_non_productive_time  # Sum of all actual hours (PT + NPT)
     
     # Calculate overall percentages
     total_productive_percentage = (total_productive_time / total_hours * 100) if total_hours > 0 else 0
     total_non_productive_percentage = (total_non_productive_time / total_hours * 100) if total_hours > 0 else 0
     utilization_percentage = (total_hours / total_ideal_hours * 100) if total_ideal_hours > 0 else 0
 
-    # Calculate average sewing speed
-    valid_speed_logs = logs.filter(reserve_numeric__gt=0)
-    average_sewing_speed = valid_speed_logs.aggregate(
-        avg_speed=Avg('reserve_numeric')
-    )['avg_speed'] or 0
+    average_sewing_speed = totals['avg_speed'] or 0
 
     # Calculate needle runtime percentage
-    sewing_logs = logs.filter(MODE=1)
-    needle_runtime_instances = sewing_logs.count()
+    needle_runtime_instances = totals['needle_runtime_instances']
     average_needle_runtime = total_needle_runtime / needle_runtime_instances if needle_runtime_instances > 0 else 0
     total_needle_runtime_hours = total_needle_runtime / 3600
     needle_runtime_percentage = (total_needle_runtime_hours / total_productive_time * 100) if total_productive_time > 0 else 0
@@ -706,109 +805,165 @@ def process_line_data(logs, line_number):
         "tableData": formatted_table_data
     }
 
+def line_totals_aggregates():
+    """
+    Mode hours, stitch count, needle runtime, sewing speed and the number of
+    sewing logs (needle runtime instances) for a line over the whole date range.
+    """
+    return dict(
+        sewing_hours=Sum('duration_hours', filter=Q(MODE=1)),
+        no_feeding_hours=Sum('duration_hours', filter=Q(MODE=3)),
+        meeting_hours=Sum('duration_hours', filter=Q(MODE=4)),
+        maintenance_hours=Sum('duration_hours', filter=Q(MODE=5)),
+        idle_hours=Sum('duration_hours', filter=Q(MODE=2)),
+        stitch_count=Sum('STITCH_COUNT'),
+        needle_runtime=Sum('NEEDLE_RUNTIME'),
+        avg_speed=Avg('RESERVE_NUMERIC', filter=Q(RESERVE_NUMERIC__gt=0)),
+        needle_runtime_instances=Count('id', filter=Q(MODE=1))
+    )
+
+def line_daily_aggregates():
+    """Per-date hours by mode, machine count, stitch count, speed and needle runtime for a line."""
+    return dict(
+        machine_count=Count('MACHINE_ID', distinct=True),
+        sewing_hours=Sum(Case(
+            When(MODE=1, then=F('duration_hours')),
+            default=Value(0),
+            output_field=FloatField()
+        )),
+        no_feeding_hours=Sum(Case(
+            When(MODE=3, then=F('duration_hours')),
+            default=Value(0),
+            output_field=FloatField()
+        )),
+        meeting_hours=Sum(Case(
+            When(MODE=4, then=F('duration_hours')),
+            default=Value(0),
+            output_field=FloatField()
+        )),
+        maintenance_hours=Sum(Case(
+            When(MODE=5, then=F('duration_hours')),
+            default=Value(0),
+            output_field=FloatField()
+        )),
+        idle_hours=Sum(Case(
+            When(MODE=2, then=F('duration_hours')),
+            default=Value(0),
+            output_field=FloatField()
+        )),
+        total_stitch_count=Sum('STITCH_COUNT'),
+        sewing_speed=Avg(Case(
+            When(RESERVE_NUMERIC__gt=0, then=F('RESERVE_NUMERIC')),
+            default=Value(0),
+            output_field=FloatField()
+        )),
+        needle_runtime=Sum('NEEDLE_RUNTIME')
+    )
+
+def process_line_data(logs, line_number):
+    """Helper function to process data for a single line"""
+    totals = logs.aggregate(**line_totals_aggregates())
+    daily_data = list(
+        logs.values('DATE').annotate(**line_daily_aggregates()).annotate(**daily_share_annotations()).order_by('DATE')
+    )
+    return build_line_report(line_number, totals, daily_data)
+
+def process_all_lines_data(logs):
+    """
+    Line reports for every line in `logs`, computed from one totals query and
+    one per-date query grouped by line instead of a pair of queries per line,
+    together with the grand totals over all lines (the rollup row of the
+    per-line totals).
+    """
+    # The per-line totals, per-date and grand-total queries are independent,
+    # so run them concurrently
+    line_totals, daily_data, overall_totals = run_concurrently(
+        lambda: list(logs.values('LINE_NUMB').annotate(**line_totals_aggregates()).order_by('LINE_NUMB')),
+        lambda: list(logs.values('LINE_NUMB', 'DATE').annotate(
+            **line_daily_aggregates()
+        ).annotate(**daily_share_annotations()).order_by('LINE_NUMB', 'DATE')),
+        lambda: logs.aggregate(**line_totals_aggregates())
+    )
+
+    # Rows arrive ordered by LINE_NUMB, so each line's rows are one contiguous run
+    daily_data_by_line = {
+        line: list(rows) for line, rows in groupby(daily_data, key=itemgetter('LINE_NUMB'))
+    }
+
+    line_reports = [
+        build_line_report(str(totals['LINE_NUMB']), totals, daily_data_by_line.get(totals['LINE_NUMB'], []))
+        for totals in line_totals
+    ]
+    return line_reports, overall_totals
+
 @api_view(['GET'])
+@cached_report(REPORT_CACHE_TIMEOUT)
+@with_parsed_dates
 def line_reports(request, line_number):
     try:
         # Get valid operator IDs from Operator model
-        valid_operators = Operator.objects.values_list('rfid_card_no', flat=True)
+        valid_operators = valid_operator_ids()
         
         # Handle "all" case - convert line_number to string first
         line_number_str = str(line_number)
         if line_number_str.lower() == 'all':
-            logs = MachineLog.objects.filter(OPERATOR_ID__in=valid_operators)
+            logs = MachineLog.objects.using(settings.REPORT_DATABASE).filter(OPERATOR_ID__in=valid_operators)
             all_lines = True
         else:
             # Convert back to integer if it's a numeric line number
             line_number = int(line_number_str)
-            logs = MachineLog.objects.filter(LINE_NUMB=line_number, OPERATOR_ID__in=valid_operators)
+            logs = MachineLog.objects.using(settings.REPORT_DATABASE).filter(LINE_NUMB=line_number, OPERATOR_ID__in=valid_operators)
             all_lines = False
     except MachineLog.DoesNotExist:
         return Response({"error": "Data not found"}, status=404)
     except ValueError:
         return Response({"error": "Invalid line number"}, status=400)
 
-    # Get date filters from query parameters
-    from_date_str = request.GET.get('from_date', '')
-    to_date_str = request.GET.get('to_date', '')
-
     # Apply date filtering if dates are provided
-    if from_date_str:
-        from_date = datetime.strptime(from_date_str, '%Y-%m-%d').date()
-        logs = logs.filter(DATE__gte=from_date)
+    if request.from_date:
+        logs = logs.filter(DATE__gte=request.from_date)
 
-    if to_date_str:
-        to_date = datetime.strptime(to_date_str, '%Y-%m-%d').date()
-        logs = logs.filter(DATE__lte=to_date)
+    if request.to_date:
+        logs = logs.filter(DATE__lte=request.to_date)
 
-    # Calculate duration in hours for each log entry
-    logs = logs.annotate(
-        start_seconds=ExpressionWrapper(
-            ExtractHour('START_TIME') * 3600 + 
-            ExtractMinute('START_TIME') * 60 + 
-            ExtractSecond('START_TIME'),
-            output_field=FloatField()
-        ),
-        end_seconds=ExpressionWrapper(
-            ExtractHour('END_TIME') * 3600 + 
-            ExtractMinute('END_TIME') * 60 + 
-            ExtractSecond('END_TIME'),
-            output_field=FloatField()
-        ),
-        duration_hours=ExpressionWrapper(
-            (F('end_seconds') - F('start_seconds')) / 3600,
-            output_field=FloatField()
-        ),
-        reserve_numeric=Cast('RESERVE', output_field=IntegerField())
-    )
-
-    # Filter for working hours (8:25 AM to 7:35 PM)
-    logs = logs.filter(
-        start_seconds__gte=30300,  # 8:25 AM (8.416667 * 3600)
-        end_seconds__lte=70500     # 7:35 PM (19.583333 * 3600)
-    )
-
-    # Exclude specific break periods (entirely within these ranges)
-    logs = logs.exclude(
-        Q(start_seconds__gte=37800, end_seconds__lte=38400) |  # 10:30-10:40
-        Q(start_seconds__gte=48000, end_seconds__lte=50400) |  # 13:20-14:00
-        Q(start_seconds__gte=58800, end_seconds__lte=59400)    # 16:20-16:30
-    )
+    # Duration of logs within working hours (8:25 AM to 7:35 PM), precomputed by the
+    # database as WORK_SECONDS; it is NULL outside working hours and for break periods
+    logs = logs.in_working_hours()
 
     # For "all" case, we'll group by line number
     if all_lines:
-        # Get distinct line numbers
-        line_numbers = logs.order_by('LINE_NUMB').values_list('LINE_NUMB', flat=True).distinct()
-        
-        all_line_reports = []
+        all_line_reports, overall = process_all_lines_data(logs)
+
+        # Additive totals come straight from the grand-total row
+        total_productive_time = overall['sewing_hours'] or 0
+        total_idle_hours = overall['idle_hours'] or 0
+        total_non_productive_time = (
+            (overall['no_feeding_hours'] or 0) +
+            (overall['meeting_hours'] or 0) +
+            (overall['maintenance_hours'] or 0) +
+            total_idle_hours
+        )
         summary_data = {
-            "totalIdealHours": 0,
-            "totalHours": 0,
-            "totalProductiveTime": 0,
-            "totalNonProductiveTime": 0,
-            "totalStitchCount": 0,
+            "totalIdealHours": total_idle_hours,  # Sum of all Mode 2 durations, as per line
+            "totalHours": total_productive_time + total_non_productive_time,
+            "totalProductiveTime": total_productive_time,
+            "totalNonProductiveTime": total_non_productive_time,
+            "totalStitchCount": overall['stitch_count'] or 0,
             "totalNeedleRuntime": 0,
             "averageSewingSpeed": 0,
             "totalWorkingDays": 0,
             "averageMachines": 0
         }
-        
+
+        # Needle runtime (seconds) as a share of productive time across all lines,
+        # from the raw sums rather than the per-line averages in totalNeedleRuntime
+        if total_productive_time > 0:
+            summary_data["needleRuntimePercentage"] = (overall['needle_runtime'] or 0) / 3600 / total_productive_time * 100
+
+        # The remaining fields combine per-line figures (averages and maxima)
         speed_sum = 0
         speed_count = 0
-        needle_runtime_count = 0
-        
-        for line_num in line_numbers:
-            line_logs = logs.filter(LINE_NUMB=line_num)
-            
-            # Process data for this line (similar to single line processing)
-            line_report = process_line_data(line_logs, str(line_num))
-            all_line_reports.append(line_report)
-            
-            # Accumulate summary data
-            summary_data["totalIdealHours"] += line_report["totalIdealHours"]
-            summary_data["totalHours"] += line_report["totalHours"]
-            summary_data["totalProductiveTime"] += line_report["totalProductiveTime"]["hours"]
-            summary_data["totalNonProductiveTime"] += line_report["totalNonProductiveTime"]["hours"]
-            summary_data["totalStitchCount"] += line_report["totalStitchCount"]
+        for line_report in all_line_reports:
             summary_data["totalNeedleRuntime"] += line_report["totalNeedleRuntime"]
             summary_data["totalWorkingDays"] = max(summary_data["totalWorkingDays"], line_report["totalWorkingDays"])
             summary_data["averageMachines"] += line_report["averageMachines"]
@@ -816,15 +971,12 @@ def line_reports(request, line_number):
             # For averages
             speed_sum += line_report["averageSewingSpeed"] * line_report["totalHours"]
             speed_count += line_report["totalHours"]
-            needle_runtime_count += line_report["totalProductiveTime"]["hours"] if line_report["totalProductiveTime"]["hours"] > 0 else 0
         
         # Calculate weighted averages
         if speed_count > 0:
             summary_data["averageSewingSpeed"] = speed_sum / speed_count
         if len(all_line_reports) > 0:
             summary_data["averageMachines"] = summary_data["averageMachines"] / len(all_line_reports)
-        if summary_data["totalProductiveTime"] > 0:
-            summary_data["needleRuntimePercentage"] = (summary_data["totalNeedleRuntime"] / summary_data["totalProductiveTime"]) * 100
         
         return Response({
             "allLinesReport": all_line_reports,
@@ -854,110 +1006,148 @@ def line_reports(request, line_number):
         line_report = process_line_data(logs, str(line_number))
         return Response(line_report)
 
-from django.db.models import Sum, Case, When, Value, FloatField, F, ExpressionWrapper, Q, IntegerField, Avg, Count
-from django.db.models.functions import ExtractHour, ExtractMinute, ExtractSecond, Cast
-from rest_framework.decorators import api_view
-from rest_framework.response import Response
-from datetime import datetime
-from .models import MachineLog
+# Column order of the per-day rows in machine report tables
+MACHINE_TABLE_COLUMNS = (
+    'Date',
+    'Sewing Hours (PT)',
+    'No Feeding Hours',
+    'Meeting Hours',
+    'Maintenance Hours',
+    'Idle Hours',
+    'Total Hours',
+    'Productive Time (PT) %',
+    'Non-Productive Time (NPT) %',
+    'Sewing Speed',
+    'Stitch Count',
+    'Needle Runtime',
+    'Machine ID',
+)
 
-def process_machine_data(logs, machine_id):
-    """Helper function to process data for a single machine"""
-    # Calculate total working days and available hours (11 hours per day)
-    distinct_dates = logs.dates('DATE', 'day')
-    total_working_days = distinct_dates.count()
-    total_available_hours = total_working_days * 11
+# Positions of the float columns in a machine table row that are rounded for output
+MACHINE_ROUNDED_COLUMNS = slice(1, 10)
 
-    # Get aggregated data by date
-    daily_data = logs.values('DATE').annotate(
-        sewing_hours=Sum(Case(
-            When(MODE=1, then=F('duration_hours')),
-            default=Value(0),
-            output_field=FloatField()
-        )),
-        no_feeding_hours=Sum(Case(
-            When(MODE=3, then=F('duration_hours')),
-            default=Value(0),
-            output_field=FloatField()
-        )),
-        meeting_hours=Sum(Case(
-            When(MODE=4, then=F('duration_hours')),
-            default=Value(0),
-            output_field=FloatField()
-        )),
-        maintenance_hours=Sum(Case(
-            When(MODE=5, then=F('duration_hours')),
-            default=Value(0),
-            output_field=FloatField()
-        )),
-        idle_hours=Sum(Case(
-            When(MODE=2, then=F('duration_hours')),
-            default=Value(0),
-            output_field=FloatField()
-        )),
+# Report hour columns and the mode whose working-window time each one sums
+MACHINE_MODE_HOURS = {
+    'sewing_hours': 1,
+    'no_feeding_hours': 3,
+    'meeting_hours': 4,
+    'maintenance_hours': 5,
+    'idle_hours': 2,
+}
+
+def machine_mode_hours_aggregates():
+    """Hours spent in each report mode, one conditional sum per MACHINE_MODE_HOURS column."""
+    return {
+        name: Coalesce(Sum('WORK_SECONDS', filter=Q(MODE=mode)), 0.0) / 3600
+        for name, mode in MACHINE_MODE_HOURS.items()
+    }
+
+def machine_daily_aggregates():
+    """Per-date hours by mode, stitch count, speed and needle runtime for a machine."""
+    return dict(
+        **machine_mode_hours_aggregates(),
         total_stitch_count=Sum('STITCH_COUNT'),
         sewing_speed=Avg(Case(
-            When(reserve_numeric__gt=0, then=F('reserve_numeric')),
+            When(RESERVE_NUMERIC__gt=0, then=F('RESERVE_NUMERIC')),
             default=Value(0),
             output_field=FloatField()
         )),
         needle_runtime=Sum('NEEDLE_RUNTIME')
-    ).order_by('DATE')
+    )
 
-    # Calculate totals
-    total_sewing_hours = 0
-    total_no_feeding_hours = 0
-    total_meeting_hours = 0
-    total_maintenance_hours = 0
-    total_idle_hours = 0
-    total_stitch_count = 0
-    total_needle_runtime = 0
-    total_hours = 0
-
-    formatted_table_data = []
-    for data in daily_data:
-        sewing_hours = data['sewing_hours'] or 0
-        no_feeding_hours = data['no_feeding_hours'] or 0
-        meeting_hours = data['meeting_hours'] or 0
-        maintenance_hours = data['maintenance_hours'] or 0
-        idle_hours = data['idle_hours'] or 0
-        
-        # Calculate PT and NPT
-        productive_time = sewing_hours
-        non_productive_time = no_feeding_hours + meeting_hours + maintenance_hours + idle_hours
-        daily_total_hours = productive_time + non_productive_time
-        
-        # Accumulate to total hours
-        total_hours += daily_total_hours
-        
-        # Calculate percentages
-        productive_time_percentage = (productive_time / daily_total_hours * 100) if daily_total_hours > 0 else 0
-        non_productive_time_percentage = (non_productive_time / daily_total_hours * 100) if daily_total_hours > 0 else 0
-        
-        formatted_table_data.append({
-            'Date': str(data['DATE']),
-            'Sewing Hours (PT)': round(sewing_hours, 2),
-            'No Feeding Hours': round(no_feeding_hours, 2),
-            'Meeting Hours': round(meeting_hours, 2),
-            'Maintenance Hours': round(maintenance_hours, 2),
-            'Idle Hours': round(idle_hours, 2),
-            'Total Hours': round(daily_total_hours, 2),
-            'Productive Time (PT) %': round(productive_time_percentage, 2),
-            'Non-Productive Time (NPT) %': round(non_productive_time_percentage, 2),
-            'Sewing Speed': round(data['sewing_speed'], 2),
-            'Stitch Count': data['total_stitch_count'],
-            'Needle Runtime': data['needle_runtime'],
-            'Machine ID': machine_id
-        })
+def machine_totals_aggregates():
+    """
+    Mode hours, stitch count, needle runtime and average sewing speed for a
+    machine over the whole date range.
+    """
+    return dict(
+        **machine_mode_hours_aggregates(),
+        stitch_count=Sum('STITCH_COUNT'),
+        needle_runtime=Sum('NEEDLE_RUNTIME'),
+        avg_speed=Avg('RESERVE_NUMERIC', filter=Q(RESERVE_NUMERIC__gt=0))
+    )
+
+def process_machine_data(logs, machine_id):
+    """Helper function to process data for a single machine"""
+    totals = logs.aggregate(**machine_totals_aggregates())
+    # Get aggregated data by date, streamed since the rows are only read once
+    daily_data = logs.values('DATE').annotate(
+        **machine_daily_aggregates()
+    ).annotate(**daily_share_annotations()).order_by('DATE')
+    return build_machine_report(machine_id, totals, daily_data.iterator(chunk_size=500))
+
+def process_all_machines_data(logs):
+    """
+    (machine_id, report builder) pairs for every machine in `logs`, computed from
+    one totals query and one per-date query grouped by machine instead of a pair
+    of queries per machine. Each report is built when its builder is called.
+    """
+    # The totals and per-date queries are independent, so run them concurrently
+    machine_totals, daily_data = run_concurrently(
+        lambda: list(logs.values('MACHINE_ID').annotate(**machine_totals_aggregates()).order_by('MACHINE_ID')),
+        lambda: list(logs.values('MACHINE_ID', 'DATE').annotate(
+            **machine_daily_aggregates()
+        ).annotate(**daily_share_annotations()).order_by('MACHINE_ID', 'DATE'))
+    )
+
+    # Rows arrive ordered by MACHINE_ID, so each machine's rows are one contiguous run
+    daily_data_by_machine = {
+        machine: list(rows) for machine, rows in groupby(daily_data, key=itemgetter('MACHINE_ID'))
+    }
 
-        # Accumulate totals
-        total_sewing_hours += sewing_hours
-        total_no_feeding_hours += no_feeding_hours
-        total_meeting_hours += meeting_hours
-        total_maintenance_hours += maintenance_hours
-        total_idle_hours += idle_hours
-        total_stitch_count += data['total_stitch_count'] or 0
-        total_needle_runtime += data['needle_runtime'] or 0
+    return [
+        (totals['MACHINE_ID'], partial(build_machine_report, totals['MACHINE_ID'], totals, daily_data_by_machine.get(totals['MACHINE_ID'], [])))
+        for totals in machine_totals
+    ]
+
+def build_machine_report(machine_id, totals, daily_data):
+    """
+    Build a machine report from that machine's range totals (machine_totals_aggregates)
+    and its per-date rows (machine_daily_aggregates), ordered by date.
+    """
+    total_sewing_hours = totals['sewing_hours'] or 0
+    total_no_feeding_hours = totals['no_feeding_hours'] or 0
+    total_meeting_hours = totals['meeting_hours'] or 0
+    total_maintenance_hours = totals['maintenance_hours'] or 0
+    total_idle_hours = totals['idle_hours'] or 0
+    total_stitch_count = totals['stitch_count'] or 0
+    total_needle_runtime = totals['needle_runtime'] or 0
+    average_sewing_speed = totals['avg_speed'] or 0
+
+    # Daily totals and PT/NPT percentages come precomputed from daily_share_annotations
+    table_rows = [
+        (
+            str(data['DATE']),
+            data['sewing_hours'],
+            data['no_feeding_hours'],
+            data['meeting_hours'],
+            data['maintenance_hours'],
+            data['idle_hours'],
+            data['daily_total_hours'],
+            data['productive_time_percentage'],
+            data['non_productive_time_percentage'],
+            data['sewing_speed'],
+            data['total_stitch_count'],
+            data['needle_runtime'],
+            machine_id
+        )
+        for data in daily_data
+    ]
+
+    # Build the row dicts once, after all the per-day arithmetic is done,
+    # rounding the hour/percentage/speed columns in the same pass
+    formatted_table_data = [
+        dict(zip(MACHINE_TABLE_COLUMNS, (
+            row[0],
+            *round_values(row[MACHINE_ROUNDED_COLUMNS]),
+            *row[MACHINE_ROUNDED_COLUMNS.stop:]
+        )))
+        for row in table_rows
+    ]
+
+    # One row per distinct date, so the rows give the working days and available hours (11 hours per day)
+    total_working_days = len(table_rows)
+    total_available_hours = total_working_days * MACHINE_DAY_HOURS
 
     # Calculate overall PT and NPT
     total_productive_time = total_sewing_hours
@@ -967,17 +1157,12 @@ def process_machine_data(logs, machine_id):
         total_maintenance_hours + 
         total_idle_hours
     )
+    total_hours = total_productive_time + total_non_productive_time
     
     # Calculate overall percentages
     total_productive_percentage = (total_productive_time / total_hours * 100) if total_hours > 0 else 0
     total_non_productive_percentage = (total_non_productive_time / total_hours * 100) if total_hours > 0 else 0
 
-    # Calculate average sewing speed
-    valid_speed_logs = logs.filter(reserve_numeric__gt=0)
-    average_sewing_speed = valid_speed_logs.aggregate(
-        avg_speed=Avg('reserve_numeric')
-    )['avg_speed'] or 0
-
     return {
         "machineId": machine_id,
         "totalAvailableHours": total_available_hours,
@@ -1004,84 +1189,44 @@ def process_machine_data(logs, machine_id):
     }
 
 @api_view(['GET'])
+@renderer_classes(REPORT_RENDERER_CLASSES)
+@cached_report(REPORT_CACHE_TIMEOUT)
+@with_parsed_dates
 def machine_reports(request, machine_id):
     try:
         # Get valid operator IDs from Operator model
-        valid_operators = Operator.objects.values_list('rfid_card_no', flat=True)
+        valid_operators = valid_operator_ids()
         
         # Handle "all" case - convert machine_id to string first
         machine_id_str = str(machine_id)
         if machine_id_str.lower() == 'all':
-            logs = MachineLog.objects.filter(OPERATOR_ID__in=valid_operators)
+            logs = MachineLog.objects.using(settings.REPORT_DATABASE).filter(OPERATOR_ID__in=valid_operators)
             all_machines = True
         else:
-            logs = MachineLog.objects.filter(MACHINE_ID=machine_id, OPERATOR_ID__in=valid_operators)
+            logs = MachineLog.objects.using(settings.REPORT_DATABASE).filter(MACHINE_ID=machine_id, OPERATOR_ID__in=valid_operators)
             all_machines = False
     except MachineLog.DoesNotExist:
         return Response({"error": "Data not found"}, status=404)
     except ValueError:
         return Response({"error": "Invalid machine ID"}, status=400)
 
-    # Get date filters from query parameters
-    from_date_str = request.GET.get('from_date', '')
-    to_date_str = request.GET.get('to_date', '')
+    # Apply date filtering if dates are provided (parsed by with_parsed_dates)
+    if request.from_date:
+        logs = logs.filter(DATE__gte=request.from_date)
 
-    # Apply date filtering if dates are provided
-    if from_date_str:
-        from_date = datetime.strptime(from_date_str, '%Y-%m-%d').date()
-        logs = logs.filter(DATE__gte=from_date)
+    if request.to_date:
+        logs = logs.filter(DATE__lte=request.to_date)
 
-    if to_date_str:
-        to_date = datetime.strptime(to_date_str, '%Y-%m-%d').date()
-        logs = logs.filter(DATE__lte=to_date)
-
-    # Calculate duration in hours for each log entry
-    logs = logs.annotate(
-        start_seconds=ExpressionWrapper(
-            ExtractHour('START_TIME') * 3600 + 
-            ExtractMinute('START_TIME') * 60 + 
-            ExtractSecond('START_TIME'),
-            output_field=FloatField()
-        ),
-        end_seconds=ExpressionWrapper(
-            ExtractHour('END_TIME') * 3600 + 
-            ExtractMinute('END_TIME') * 60 + 
-            ExtractSecond('END_TIME'),
-            output_field=FloatField()
-        ),
-        duration_hours=ExpressionWrapper(
-            (F('end_seconds') - F('start_seconds')) / 3600,
-            output_field=FloatField()
-        ),
-        reserve_numeric=Cast('RESERVE', output_field=IntegerField())
-    )
-
-    # Filter for working hours (8:25 AM to 7:35 PM)
-    logs = logs.filter(
-        start_seconds__gte=30300,  # 8:25 AM (8.416667 * 3600)
-        end_seconds__lte=70500     # 7:35 PM (19.583333 * 3600)
-    )
-
-    # Exclude specific break periods (entirely within these ranges)
-    logs = logs.exclude(
-        Q(start_seconds__gte=37800, end_seconds__lte=38400) |  # 10:30-10:40
-        Q(start_seconds__gte=48000, end_seconds__lte=50400) |  # 13:20-14:00
-        Q(start_seconds__gte=58800, end_seconds__lte=59400)    # 16:20-16:30
-    )
+    # WORK_SECONDS is NULL outside working hours (8:25 AM to 7:35 PM) and for break periods
+    logs = logs.in_working_hours()
 
     # For "all" case, we'll group by machine ID
     if all_machines:
-        # Get distinct machine IDs
-        machine_ids = logs.order_by('MACHINE_ID').values_list('MACHINE_ID', flat=True).distinct()
-        
         all_machine_reports = []
         
-        for machine_id in machine_ids:
-            machine_logs = logs.filter(MACHINE_ID=machine_id)
-            
-            # Process data for this machine
-            machine_report = process_machine_data(machine_logs, machine_id)
-            all_machine_reports.append(machine_report)
+        # Process data for every machine with grouped queries
+        for machine_id, build_report in process_all_machines_data(logs):
+            all_machine_reports.append(build_report())
         
         return Response({
             "allMachinesReport": all_machine_reports,
@@ -1094,84 +1239,68 @@ def machine_reports(request, machine_id):
 
 
 @api_view(['GET'])
+@cached_report(REPORT_CACHE_TIMEOUT)
+@with_parsed_dates
 def all_machines_report(request):
     try:
         # Get valid operator IDs from Operator model
-        valid_operators = Operator.objects.values_list('rfid_card_no', flat=True)
-        logs = MachineLog.objects.filter(OPERATOR_ID__in=valid_operators)
+        valid_operators = valid_operator_ids()
+        logs = MachineLog.objects.using(settings.REPORT_DATABASE).filter(OPERATOR_ID__in=valid_operators)
     except Exception as e:
         return Response({"error": str(e)}, status=500)
 
-    # Get date filters from query parameters
-    from_date_str = request.GET.get('from_date', '')
-    to_date_str = request.GET.get('to_date', '')
+    # Apply date filtering if dates are provided (parsed by with_parsed_dates)
+    if request.from_date:
+        logs = logs.filter(DATE__gte=request.from_date)
 
-    # Apply date filtering if dates are provided
-    if from_date_str:
-        try:
-            from_date = datetime.strptime(from_date_str, '%Y-%m-%d').date()
-            logs = logs.filter(DATE__gte=from_date)
-        except ValueError:
-            return Response({"error": "Invalid from_date format. Use YYYY-MM-DD"}, status=400)
+    if request.to_date:
+        logs = logs.filter(DATE__lte=request.to_date)
 
-    if to_date_str:
-        try:
-            to_date = datetime.strptime(to_date_str, '%Y-%m-%d').date()
-            logs = logs.filter(DATE__lte=to_date)
-        except ValueError:
-            return Response({"error": "Invalid to_date format. Use YYYY-MM-DD"}, status=400)
-
-    # Calculate duration in hours for each log entry
-    logs = logs.annotate(
-        start_seconds=ExpressionWrapper(
-            ExtractHour('START_TIME') * 3600 + 
-            ExtractMinute('START_TIME') * 60 + 
-            ExtractSecond('START_TIME'),
-            output_field=FloatField()
-        ),
-        end_seconds=ExpressionWrapper(
-            ExtractHour('END_TIME') * 3600 + 
-            ExtractMinute('END_TIME') * 60 + 
-            ExtractSecond('END_TIME'),
-            output_field=FloatField()
-        ),
-        duration_hours=ExpressionWrapper(
-            (F('end_seconds') - F('start_seconds')) / 3600,
-            output_field=FloatField()
-        ),
-        reserve_numeric=Cast('RESERVE', output_field=IntegerField())
-    ).filter(
-        start_seconds__gte=30300,  # 8:25 AM (8.416667 * 3600)
-        end_seconds__lte=70500     # 7:35 PM (19.583333 * 3600)
-    ).exclude(
-        Q(start_seconds__gte=37800, end_seconds__lte=38400) |  # 10:30-10:40
-        Q(start_seconds__gte=48000, end_seconds__lte=50400) |  # 13:20-14:00
-        Q(start_seconds__gte=58800, end_seconds__lte=59400)    # 16:20-16:30
-    )
+    # WORK_SECONDS is NULL outside working hours (8:25 AM to 7:35 PM) and for break periods
+    logs = logs.in_working_hours()
 
-    # Get distinct machine IDs
-    machine_ids = logs.order_by('MACHINE_ID').values_list('MACHINE_ID', flat=True).distinct()
-    
     all_machine_reports = []
     
-    for machine_id in machine_ids:
-        machine_logs = logs.filter(MACHINE_ID=machine_id)
-        
-        # Process data for this machine
+    # Process data for every machine with grouped queries
+    for machine_id, build_report in process_all_machines_data(logs):
         try:
-            machine_report = process_machine_data(machine_logs, machine_id)
+            machine_report = build_report()
             all_machine_reports.append(machine_report)
         except Exception as e:
-            print(f"Error processing machine {machine_id}: {str(e)}")
+            logger.exception("Error processing machine %s", machine_id)
             continue
     
     return Response({
         "allMachinesReport": all_machine_reports,
         "totalMachines": len(all_machine_reports),
-        "from_date": from_date_str,
-        "to_date": to_date_str
+        "from_date": request.GET.get('from_date', ''),
+        "to_date": request.GET.get('to_date', '')
     })
+
+def build_operator_summary(rfid_card_no, operator_name, total_working_days, total_production_seconds):
+    """Summary report for one operator from their working days and production (mode 1) seconds"""
+    total_available_hours = total_working_days * OPERATOR_DAY_HOURS
+
+    total_production_hours = total_production_seconds / 3600
+    total_non_production_hours = total_available_hours - total_production_hours
+
+    production_percentage = (total_production_hours / total_available_hours * 100) if total_available_hours > 0 else 0
+    npt_percentage = 100 - production_percentage
+
+    return {
+        "operatorId": rfid_card_no,
+        "operatorName": operator_name,
+        "totalProductionHours": round(total_production_hours, 2),
+        "totalNonProductionHours": round(total_non_production_hours, 2),
+        "productionPercentage": round(production_percentage, 2),
+        "nptPercentage": round(npt_percentage, 2),
+    }
+
+
 @api_view(['GET'])
+@renderer_classes(REPORT_RENDERER_CLASSES)
+@cached_report(REPORT_CACHE_TIMEOUT)
+@with_parsed_dates
 def operator_reports_all(request):
     """
     Generate summary performance reports for all operators.
@@ -1186,186 +1315,111 @@ def operator_reports_all(request):
         - Production vs non-production hours
         - Efficiency percentages
     """
-    operators = Operator.objects.all()
-    from_date_str = request.GET.get('from_date', '')
-    to_date_str = request.GET.get('to_date', '')
+    operators = get_operators()
 
-    all_operators_data = []
+    logs = MachineLog.objects.filter(OPERATOR_ID__in=[rfid_card_no for rfid_card_no, _ in operators])
 
-    for operator in operators:
-        logs = MachineLog.objects.filter(OPERATOR_ID=operator.rfid_card_no)
-
-        # Apply date filtering if dates are provided
-        if from_date_str:
-            from_date = datetime.strptime(from_date_str, '%Y-%m-%d').date()
-            logs = logs.filter(DATE__gte=from_date)
-
-        if to_date_str:
-            to_date = datetime.strptime(to_date_str, '%Y-%m-%d').date()
-            logs = logs.filter(DATE__lte=to_date)
-
-        # Exclude records where OPERATOR_ID is 0 AND MODE is 2
-        logs = logs.exclude(Q(OPERATOR_ID=0) & Q(MODE=2))
-
-        # Calculate duration in hours
-        logs = logs.annotate(
-            start_seconds=ExpressionWrapper(
-                ExtractHour('START_TIME') * 3600 +
-                ExtractMinute('START_TIME') * 60 +
-                ExtractSecond('START_TIME'),
-                output_field=FloatField()
-            ),
-            end_seconds=ExpressionWrapper(
-                ExtractHour('END_TIME') * 3600 +
-                ExtractMinute('END_TIME') * 60 +
-                ExtractSecond('END_TIME'),
-                output_field=FloatField()
-            ),
-            adjusted_start_seconds=Case(
-                When(start_seconds__lt=8.5 * 3600, then=Value(8.5 * 3600)),
-                When(start_seconds__gt=19.5 * 3600, then=Value(19.5 * 3600)),
-                default=F('start_seconds'),
-                output_field=FloatField()
-            ),
-            adjusted_end_seconds=Case(
-                When(end_seconds__lt=8.5 * 3600, then=Value(8.5 * 3600)),
-                When(end_seconds__gt=19.5 * 3600, then=Value(19.5 * 3600)),
-                default=F('end_seconds'),
-                output_field=FloatField()
-            ),
-            duration_hours=Case(
-                When(
-                    Q(end_seconds__lte=8.5 * 3600) | Q(start_seconds__gte=19.5 * 3600),
-                    then=Value(0)
-                ),
-                default=ExpressionWrapper(
-                    (F('adjusted_end_seconds') - F('adjusted_start_seconds')) / 3600,
-                    output_field=FloatField()
-                ),
-                output_field=FloatField()
-            )
-        ).filter(duration_hours__gt=0)
-
-        # Filter out break times
-        logs = logs.exclude(
-            Q(start_seconds__gte=10.5 * 3600, end_seconds__lte=10.6667 * 3600) |
-            Q(start_seconds__gte=13.3333 * 3600, end_seconds__lte=14 * 3600) |
-            Q(start_seconds__gte=16.3333 * 3600, end_seconds__lte=16.5 * 3600)
-        )
+    # Apply date filtering if dates are provided
+    if request.from_date:
+        logs = logs.filter(DATE__gte=request.from_date)
 
-        # Calculate metrics
-        total_working_days = logs.values('DATE').distinct().count()
-        total_available_hours = total_working_days * 10
+    if request.to_date:
+        logs = logs.filter(DATE__lte=request.to_date)
 
-        mode_hours = logs.values('MODE').annotate(
-            total_hours=Sum('duration_hours')
-        )
+    # Exclude records where OPERATOR_ID is 0 AND MODE is 2
+    logs = logs.exclude(Q(OPERATOR_ID="0") & Q(MODE=2))
+
+    # SHIFT_SECONDS is the duration clamped to the shift (8:30 AM to 7:30 PM),
+    # NULL when nothing of the log falls within it or it lies within a break
+    logs = logs.in_shift()
+
+    # Working days and production seconds for every operator in one grouped query
+    operator_totals = {
+        row['OPERATOR_ID']: row
+        for row in logs.values('OPERATOR_ID').annotate(
+            working_days=Count('DATE', distinct=True),
+            production_seconds=Sum('SHIFT_SECONDS', filter=Q(MODE=1))
+        ).order_by()
+    }
 
-        total_production_hours = sum(
-            mode['total_hours'] for mode in mode_hours if mode['MODE'] == 1
-        )
-        total_non_production_hours = total_available_hours - total_production_hours
-
-        production_percentage = (total_production_hours / total_available_hours * 100) if total_available_hours > 0 else 0
-        npt_percentage = 100 - production_percentage
-
-        all_operators_data.append({
-            "operatorId": operator.rfid_card_no,
-            "operatorName": operator.operator_name,
-            "totalProductionHours": round(total_production_hours, 2),
-            "totalNonProductionHours": round(total_non_production_hours, 2),
-            "productionPercentage": round(production_percentage, 2),
-            "nptPercentage": round(npt_percentage, 2),
-        })
+    all_operators_data = []
+    for rfid_card_no, operator_name in operators:
+        totals = operator_totals.get(rfid_card_no, {})
+        all_operators_data.append(build_operator_summary(
+            rfid_card_no,
+            operator_name,
+            totals.get('working_days', 0),
+            totals.get('production_seconds') or 0
+        ))
 
     return Response(all_operators_data)
 
-from rest_framework.decorators import api_view
-from rest_framework.response import Response
-from .models import MachineLog, Operator
+# MachineLog columns returned by the log filter endpoints (everything but the generated columns)
+LOG_ROW_FIELDS = tuple(
+    field.attname for field in MachineLog._meta.concrete_fields
+    if field.name not in GENERATED_FIELDS
+)
 
-MODES = {
-    1: "Sewing",
-    2: "Idle",
-    3: "No feeding",
-    4: "Meeting",
-    5: "Maintenance",
-}
+def described_log_rows(queryset):
+    """
+    Plain dict rows of `queryset` with the mode description and operator name
+    added, generated lazily from a database iterator without building model
+    instances.
+    """
+    # Bound lookups, resolved once rather than per row; "0" (no operator logged
+    # in) is left out of the name map so it needs no separate check
+    describe_mode = MODES.get
+    operator_name = {
+        rfid_card_no: name for rfid_card_no, name in get_operators() if rfid_card_no != "0"
+    }.get
+    return (
+        {
+            **row,
+            'mode_description': describe_mode(row['MODE'], 'Unknown mode'),
+            'operator_name': operator_name(row['OPERATOR_ID'], "")
+        }
+        for row in queryset.values(*LOG_ROW_FIELDS).iterator(chunk_size=2000)
+    )
 
 @api_view(['GET'])
+@with_parsed_dates
 def filter_logs(request):
     line_number = request.GET.get('line_number')
-    from_date = request.GET.get('from_date')
-    to_date = request.GET.get('to_date')
-    
     queryset = MachineLog.objects.all()
     
     if line_number and line_number.lower() != 'all':
         queryset = queryset.filter(LINE_NUMB=line_number)
     
-    if from_date:
-        queryset = queryset.filter(DATE__gte=from_date)
-    
-    if to_date:
-        queryset = queryset.filter(DATE__lte=to_date)
-    
-    # Prefetch operator data to optimize queries
-    logs = list(queryset)
-    operator_ids = set(log.OPERATOR_ID for log in logs if log.OPERATOR_ID != "0")
-    operators = Operator.objects.filter(rfid_card_no__in=operator_ids)
-    operator_map = {op.rfid_card_no: op.operator_name for op in operators}
+    if request.from_date:
+        queryset = queryset.filter(DATE__gte=request.from_date)
     
-    data = []
-    for log in logs:
-        log_data = {
-            **log.__dict__,
-            'mode_description': MODES.get(log.MODE, 'Unknown mode'),
-            'operator_name': operator_map.get(log.OPERATOR_ID, "") if log.OPERATOR_ID != "0" else ""
-        }
-        # Remove Django internal fields
-        log_data.pop('_state', None)
-        data.append(log_data)
+    if request.to_date:
+        queryset = queryset.filter(DATE__lte=request.to_date)
     
-    return Response(data)
+    # Encode rows as they are read instead of building the whole list first
+    return StreamingHttpResponse(stream_json_array(described_log_rows(queryset)), content_type='application/json')
 
 
 @api_view(['GET'])
+@with_parsed_dates
 def filter_logs_by_machine_id(request):
     machine_id = request.GET.get('machine_id')
-    from_date = request.GET.get('from_date')
-    to_date = request.GET.get('to_date')
-    
     queryset = MachineLog.objects.all()
     
     if machine_id and machine_id.lower() != 'all':
         queryset = queryset.filter(MACHINE_ID=machine_id)
     
-    if from_date:
-        queryset = queryset.filter(DATE__gte=from_date)
+    if request.from_date:
+        queryset = queryset.filter(DATE__gte=request.from_date)
     
-    if to_date:
-        queryset = queryset.filter(DATE__lte=to_date)
+    if request.to_date:
+        queryset = queryset.filter(DATE__lte=request.to_date)
     
-    # Prefetch operator data to optimize queries
-    logs = list(queryset)
-    operator_ids = set(log.OPERATOR_ID for log in logs if log.OPERATOR_ID != "0")
-    operators = Operator.objects.filter(rfid_card_no__in=operator_ids)
-    operator_map = {op.rfid_card_no: op.operator_name for op in operators}
-    
-    data = []
-    for log in logs:
-        log_data = {
-            **log.__dict__,
-            'mode_description': MODES.get(log.MODE, 'Unknown mode'),
-            'operator_name': operator_map.get(log.OPERATOR_ID, "") if log.OPERATOR_ID != "0" else ""
-        }
-        # Remove Django internal fields
-        log_data.pop('_state', None)
-        data.append(log_data)
-    
-    return Response(data)
+    # Encode rows as they are read instead of building the whole list first
+    return StreamingHttpResponse(stream_json_array(described_log_rows(queryset)), content_type='application/json')
 
 @api_view(['GET'])
+@cached_report(REPORT_CACHE_TIMEOUT)
 def get_line_numbers(request):
     from_date = request.GET.get('from_date')
     to_date = request.GET.get('to_date')
@@ -1378,10 +1432,12 @@ def get_line_numbers(request):
         DATE__lte=to_date
     ).values_list('LINE_NUMB', flat=True).distinct()
     
-    line_numbers = sorted(list(queryset))
+    # Sorted by the database rather than in Python
+    line_numbers = list(queryset.order_by('LINE_NUMB'))
     return Response({"line_numbers": line_numbers})
 
 @api_view(['GET'])
+@cached_report(REPORT_CACHE_TIMEOUT)
 def get_machine_ids(request):
     from_date = request.GET.get('from_date')
     to_date = request.GET.get('to_date')
@@ -1394,7 +1450,8 @@ def get_machine_ids(request):
         DATE__lte=to_date
     ).values_list('MACHINE_ID', flat=True).distinct()
     
-    machine_ids = sorted(list(queryset))
+    # Sorted by the database rather than in Python
+    machine_ids = list(queryset.order_by('MACHINE_ID'))
     return Response({"machine_ids": machine_ids})
 
 
@@ -1403,22 +1460,8 @@ def get_machine_ids(request):
 
 
 
-# views.py
-from rest_framework.decorators import api_view
-from rest_framework.response import Response
-from django.db.models import Sum, Count, Avg
-from datetime import timedelta
-
-
-MODES = {
-    1: "Sewing",
-    2: "Idle",
-    3: "No feeding",
-    4: "Meeting",
-    5: "Maintenance",
-}
-
 @api_view(['GET'])
+@cached_report(REPORT_CACHE_TIMEOUT)
 def get_operator_ids(request):
     from_date = request.GET.get('from_date')
     to_date = request.GET.get('to_date')
@@ -1431,7 +1474,8 @@ def get_operator_ids(request):
         DATE__lte=to_date
     ).exclude(OPERATOR_ID="0").values_list('OPERATOR_ID', flat=True).distinct()
     
-    operator_ids = sorted(list(queryset))
+    # Sorted by the database rather than in Python
+    operator_ids = list(queryset.order_by('OPERATOR_ID'))
     return Response({"operator_ids": operator_ids})
 
 @api_view(['GET'])
@@ -1446,77 +1490,65 @@ def operator_report(request, operator_id):
     if to_date:
         queryset = queryset.filter(DATE__lte=to_date)
     
-    # Get operator name
-    operator_name = ""
-    try:
-        operator = Operator.objects.get(rfid_card_no=operator_id)
-        operator_name = operator.operator_name
-    except Operator.DoesNotExist:
-        pass
-    
-    # Calculate totals
-    total_hours = queryset.aggregate(
-        total_hours=Sum('NEEDLE_RUNTIME')
-    )['total_hours'] or 0
-    
-    productive_hours = queryset.filter(MODE=1).aggregate(
-        total=Sum('NEEDLE_RUNTIME')
-    )['total'] or 0
-    
-    no_feeding_hours = queryset.filter(MODE=3).aggregate(
-        total=Sum('NEEDLE_RUNTIME')
-    )['total'] or 0
-    
-    meeting_hours = queryset.filter(MODE=4).aggregate(
-        total=Sum('NEEDLE_RUNTIME')
-    )['total'] or 0
-    
-    maintenance_hours = queryset.filter(MODE=5).aggregate(
-        total=Sum('NEEDLE_RUNTIME')
-    )['total'] or 0
-    
-    idle_hours = queryset.filter(MODE=2).aggregate(
-        total=Sum('NEEDLE_RUNTIME')
-    )['total'] or 0
-    
-    total_stitch_count = queryset.aggregate(
-        total=Sum('STITCH_COUNT')
-    )['total'] or 0
-    
-    # Prepare daily data
+    # Get operator name from the cached operator list
+    operator_name = dict(get_operators()).get(operator_id, "")
+    
+    # Calculate totals, one zero-filled conditional sum per mode in a single query
+    totals = queryset.aggregate(
+        total_hours=Coalesce(Sum('NEEDLE_RUNTIME'), 0.0),
+        productive_hours=Coalesce(Sum('NEEDLE_RUNTIME', filter=Q(MODE=1)), 0.0),
+        no_feeding_hours=Coalesce(Sum('NEEDLE_RUNTIME', filter=Q(MODE=3)), 0.0),
+        meeting_hours=Coalesce(Sum('NEEDLE_RUNTIME', filter=Q(MODE=4)), 0.0),
+        maintenance_hours=Coalesce(Sum('NEEDLE_RUNTIME', filter=Q(MODE=5)), 0.0),
+        idle_hours=Coalesce(Sum('NEEDLE_RUNTIME', filter=Q(MODE=2)), 0.0),
+        total_stitch_count=Coalesce(Sum('STITCH_COUNT'), 0)
+    )
+    total_hours = totals['total_hours']
+    productive_hours = totals['productive_hours']
+    no_feeding_hours = totals['no_feeding_hours']
+    meeting_hours = totals['meeting_hours']
+    maintenance_hours = totals['maintenance_hours']
+    idle_hours = totals['idle_hours']
+    total_stitch_count = totals['total_stitch_count']
+    
+    # Prepare daily data; zero-filled hours and the PT percentage are computed
+    # in the database so the table rows need no per-row arithmetic in Python
     daily_data = queryset.values('DATE').annotate(
-        sewing_hours=Sum('NEEDLE_RUNTIME', filter=operator.Q(MODE=1)),
-        no_feeding_hours=Sum('NEEDLE_RUNTIME', filter=operator.Q(MODE=3)),
-        meeting_hours=Sum('NEEDLE_RUNTIME', filter=operator.Q(MODE=4)),
-        maintenance_hours=Sum('NEEDLE_RUNTIME', filter=operator.Q(MODE=5)),
-        idle_hours=Sum('NEEDLE_RUNTIME', filter=operator.Q(MODE=2)),
-        total_hours=Sum('NEEDLE_RUNTIME'),
-        stitch_count=Sum('STITCH_COUNT'),
+        sewing_hours=Coalesce(Sum('NEEDLE_RUNTIME', filter=Q(MODE=1)), 0.0),
+        no_feeding_hours=Coalesce(Sum('NEEDLE_RUNTIME', filter=Q(MODE=3)), 0.0),
+        meeting_hours=Coalesce(Sum('NEEDLE_RUNTIME', filter=Q(MODE=4)), 0.0),
+        maintenance_hours=Coalesce(Sum('NEEDLE_RUNTIME', filter=Q(MODE=5)), 0.0),
+        idle_hours=Coalesce(Sum('NEEDLE_RUNTIME', filter=Q(MODE=2)), 0.0),
+        total_hours=Coalesce(Sum('NEEDLE_RUNTIME'), 0.0),
+        stitch_count=Coalesce(Sum('STITCH_COUNT'), 0),
         machine_count=Count('MACHINE_ID', distinct=True),
-        avg_sewing_speed=Avg('RESERVE')
+        avg_sewing_speed=Coalesce(Avg('RESERVE_NUMERIC'), 0.0)
+    ).annotate(
+        pt_percentage=Case(
+            When(total_hours__gt=0, then=F('sewing_hours') * 100.0 / F('total_hours')),
+            default=Value(0.0),
+            output_field=FloatField()
+        )
     ).order_by('DATE')
     
     # Format daily data for table
-    table_data = []
-    for day in daily_data:
-        day_total = day['total_hours'] or 0
-        pt_percentage = (day['sewing_hours'] / day_total * 100) if day_total > 0 else 0
-        npt_percentage = 100 - pt_percentage
-        
-        table_data.append({
+    table_data = [
+        {
             "Date": day['DATE'],
-            "Sewing Hours (PT)": day['sewing_hours'] or 0,
-            "No Feeding Hours": day['no_feeding_hours'] or 0,
-            "Meeting Hours": day['meeting_hours'] or 0,
-            "Maintenance Hours": day['maintenance_hours'] or 0,
-            "Idle Hours": day['idle_hours'] or 0,
-            "Total Hours": day_total,
-            "Productive Time (PT) %": round(pt_percentage, 2),
-            "Non-Productive Time (NPT) %": round(npt_percentage, 2),
-            "Sewing Speed": round(day['avg_sewing_speed'] or 0, 2),
-            "Stitch Count": day['stitch_count'] or 0,
-            "Machine Count": day['machine_count'] or 0
-        })
+            "Sewing Hours (PT)": day['sewing_hours'],
+            "No Feeding Hours": day['no_feeding_hours'],
+            "Meeting Hours": day['meeting_hours'],
+            "Maintenance Hours": day['maintenance_hours'],
+            "Idle Hours": day['idle_hours'],
+            "Total Hours": day['total_hours'],
+            "Productive Time (PT) %": round(day['pt_percentage'], 2),
+            "Non-Productive Time (NPT) %": round(100 - day['pt_percentage'], 2),
+            "Sewing Speed": round(day['avg_sewing_speed'], 2),
+            "Stitch Count": day['stitch_count'],
+            "Machine Count": day['machine_count']
+        }
+        for day in daily_data
+    ]
     
     # Calculate percentages
     pt_percentage = (productive_hours / total_hours * 100) if total_hours > 0 else 0
@@ -1555,70 +1587,52 @@ def all_operators_report(request):
     if not from_date or not to_date:
         return Response({"error": "Both from_date and to_date are required"}, status=400)
     
-    # Get all operator data
-    operators = MachineLog.objects.filter(
+    # Totals for every operator in one grouped query
+    operator_totals = MachineLog.objects.filter(
         DATE__gte=from_date,
         DATE__lte=to_date
-    ).exclude(OPERATOR_ID="0").values('OPERATOR_ID').distinct()
+    ).exclude(OPERATOR_ID="0").values('OPERATOR_ID').annotate(
+        total_hours=Coalesce(Sum('NEEDLE_RUNTIME'), 0.0),
+        productive_hours=Coalesce(Sum('NEEDLE_RUNTIME', filter=Q(MODE=1)), 0.0),
+        stitch_count=Coalesce(Sum('STITCH_COUNT'), 0),
+        machine_count=Count('MACHINE_ID', distinct=True)
+    ).order_by()
+
+    operator_names = dict(get_operators())
     
     all_operators_report = []
     
-    for operator in operators:
-        operator_id = operator['OPERATOR_ID']
-        operator_data = MachineLog.objects.filter(
-            OPERATOR_ID=operator_id,
-            DATE__gte=from_date,
-            DATE__lte=to_date
-        )
-        
-        # Get operator name
-        operator_name = ""
-        try:
-            operator_obj = Operator.objects.get(rfid_card_no=operator_id)
-            operator_name = operator_obj.operator_name
-        except Operator.DoesNotExist:
-            pass
-        
-        # Calculate totals
-        total_hours = operator_data.aggregate(
-            total_hours=Sum('NEEDLE_RUNTIME')
-        )['total_hours'] or 0
-        
-        productive_hours = operator_data.filter(MODE=1).aggregate(
-            total=Sum('NEEDLE_RUNTIME')
-        )['total'] or 0
-        
+    for totals in operator_totals:
+        total_hours = totals['total_hours']
+        productive_hours = totals['productive_hours']
         pt_percentage = (productive_hours / total_hours * 100) if total_hours > 0 else 0
         
         all_operators_report.append({
-            "operator_id": operator_id,
-            "operator_name": operator_name,
+            "operator_id": totals['OPERATOR_ID'],
+            "operator_name": operator_names.get(totals['OPERATOR_ID'], ""),
             "total_hours": round(total_hours, 2),
             "productive_hours": round(productive_hours, 2),
             "productive_percentage": round(pt_percentage, 2),
-            "stitch_count": operator_data.aggregate(
-                total=Sum('STITCH_COUNT')
-            )['total'] or 0,
-            "machine_count": operator_data.values('MACHINE_ID').distinct().count()
+            "stitch_count": totals['stitch_count'],
+            "machine_count": totals['machine_count']
         })
     
     return Response({"allOperatorsReport": all_operators_report})
 
 
-from rest_framework.decorators import api_view
-from rest_framework.response import Response
-from .models import MachineLog
-from .serializers import MachineLogSerializer
-
 @api_view(['GET'])
+@condition(etag_func=report_etag)
 def get_consolidated_logs(request):
     """
     View to retrieve machine logs with optional date filtering.
+
+    Responses carry an ETag from report_fingerprint(), so clients revalidating
+    with If-None-Match get a 304 until the report data version changes.
     """
     from_date = request.query_params.get('from_date')
     to_date = request.query_params.get('to_date')
     
-    logs = MachineLog.objects.all()
+    logs = MachineLog.objects.defer(*GENERATED_FIELDS)
     
     if from_date:
         logs = logs.filter(DATE__gte=from_date)
@@ -1626,14 +1640,20 @@ def get_consolidated_logs(request):
         logs = logs.filter(DATE__lte=to_date)
     
     logs = logs.order_by('-DATE')[:10000]
-    
-    serialized_logs = MachineLogSerializer(logs, many=True).data
 
-    # Add indexing (1, 2, 3...)
-    for idx, log in enumerate(serialized_logs, start=1):
-        log['index'] = idx
+    # Serialize and encode rows one at a time as the response is streamed,
+    # with the operator names and mode messages loaded once for all rows
+    serializer = MachineLogSerializer(context={
+        'operator_names': dict(get_operators()),
+        'mode_messages': get_mode_messages(),
+    })
+    serialized_logs = (
+        # Add indexing (1, 2, 3...)
+        {**serializer.to_representation(log), 'index': idx}
+        for idx, log in enumerate(logs.iterator(chunk_size=1000), start=1)
+    )
 
-    return Response(serialized_logs)
+    return StreamingHttpResponse(stream_json_array(serialized_logs), content_type='application/json')
 
 
 
@@ -88,6 +88,31 @@ DATABASES = {
     }
 }
 
+# Optional read replica for the report endpoints (reports fall back to the
+# primary database when PGREPLICA_HOST is not set)
+if os.environ.get('PGREPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.environ['PGREPLICA_HOST'],
+        'PORT': os.environ.get('PGREPLICA_PORT', DATABASES['default']['PORT']),
+    }
+REPORT_DATABASE = 'replica' if 'replica' in DATABASES else 'default'
+
+# Seconds the replica may lag behind the primary. Reports read from the
+# replica aren't cached until this long after their data last changed, so a
+# lagging read isn't stored under the new version (see cached_report).
+REPORT_REPLICA_LAG = int(os.environ.get('PGREPLICA_MAX_LAG', '5'))
+
+# Cache (used for short-lived caching of summary endpoints and lookup tables).
+# Stored in the database so every gunicorn worker shares it; the table is
+# created by `python manage.py createcachetable`.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+    }
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {